@@ -49,8 +49,8 @@ def process_reevaluation(job_id: str, task_file: Path, dry_run: bool = False) ->
     try:
         result = subprocess.run(
             ["python3", str(reevaluate_script), "--job", job_id, "--candidate", candidate_id, "--force"],
-            capture_output=True,
-            text=True,
+            stdout=subprocess.DEVNULL,  # child's log output is never read
+            stderr=subprocess.PIPE,
             timeout=60
         )
         
@@ -64,11 +64,13 @@ def process_reevaluation(job_id: str, task_file: Path, dry_run: bool = False) ->
             
             return True
         else:
-            logger.error(f"Re-evaluation failed for {candidate_id}: {result.stderr}")
+            # stderr stays raw bytes unless the run actually failed
+            stderr = result.stderr.decode("utf-8", "replace")
+            logger.error(f"Re-evaluation failed for {candidate_id}: {stderr}")
             
             # Mark as failed
             task["status"] = "failed"
-            task["error"] = result.stderr[:500]
+            task["error"] = stderr[:500]
             task_file.write_text(json.dumps(task, indent=2))
             
             return False
@@ -11,9 +11,19 @@ import logging
 from pathlib import Path
 from datetime import datetime, UTC
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+PREVIEW_BYTES = 500  # dry-run preview length of dossier.md
+
+
+def utc_timestamp() -> str:
+    return datetime.now(UTC).isoformat(timespec="seconds")
+
 
 def read_json(p: Path):
     if not p.exists():
@@ -25,24 +35,29 @@ def read_json(p: Path):
         return None
 
 
+def dumps_json(obj) -> bytes:
+    """Serialize obj as 2-space indented JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 def format_elite_signals(signals):
     """Format elite signals with confidence + boost factor."""
     if not signals:
-        return ["No elite signals detected"]
+        return "No elite signals detected"
     
-    lines = []
-    for sig in signals:
-        detail = sig.get("detail", "Unknown")
-        conf = sig.get("confidence", 0)
-        boost = sig.get("boost_factor", 1.0)
-        lines.append(f"- {detail} (confidence: {conf:.2f}, boost: {boost:.2f}x)")
-    return lines
+    return "\n".join(
+        f"- {sig.get('detail', 'Unknown')} "
+        f"(confidence: {sig.get('confidence', 0):.2f}, boost: {sig.get('boost_factor', 1.0):.2f}x)"
+        for sig in signals
+    )
 
 
 def format_business_impact(impacts):
     """Format business impact with dollar amounts and context."""
     if not impacts:
-        return ["No quantified business impact found"]
+        return "No quantified business impact found"
     
     lines = []
     for imp in impacts:
@@ -56,42 +71,48 @@ def format_business_impact(impacts):
         else:
             value_str = f"${value*1000:.0f}K"
         
-        lines.append(f"- {value_str} {impact_type} (confidence: {conf:.2f})")
+        line = f"- {value_str} {impact_type} (confidence: {conf:.2f})"
         if context:
-            lines.append(f"  Context: {context}...")
-    return lines
+            line = f"{line}\n  Context: {context}..."
+        lines.append(line)
+    return "\n".join(lines)
 
 
 def format_concerns(concerns):
     """Format concerns with severity and mitigation info."""
     if not concerns:
-        return ["None identified"]
+        return "None identified"
     
-    lines = []
-    for concern in concerns:
-        issue = concern.get("issue", "Unknown issue")
-        severity = concern.get("severity", "unknown")
-        can_mitigate = concern.get("can_mitigate", False)
-        mitigation_str = "✓ Can mitigate" if can_mitigate else "✗ Hard to mitigate"
-        lines.append(f"- **{issue}** (severity: {severity}, {mitigation_str})")
-    return lines
+    return "\n".join(
+        f"- **{c.get('issue', 'Unknown issue')}** (severity: {c.get('severity', 'unknown')}, "
+        f"{'✓ Can mitigate' if c.get('can_mitigate', False) else '✗ Hard to mitigate'})"
+        for c in concerns
+    )
 
 
 def format_strengths_table(strengths):
     """Format key strengths as markdown table."""
     if not strengths:
-        return ["No key strengths identified"]
+        return "No key strengths identified"
     
-    lines = [
-        "| Category | Evidence | Relevance |",
-        "|----------|----------|-----------|"
-    ]
-    for s in strengths:
-        category = s.get("category", "Unknown")
-        evidence = s.get("evidence", "N/A")
-        relevance = s.get("relevance", "N/A")
-        lines.append(f"| {category} | {evidence} | {relevance} |")
-    return lines
+    rows = "\n".join(
+        f"| {s.get('category', 'Unknown')} | {s.get('evidence', 'N/A')} | {s.get('relevance', 'N/A')} |"
+        for s in strengths
+    )
+    return (
+        "| Category | Evidence | Relevance |\n"
+        "|----------|----------|-----------|\n"
+        f"{rows}"
+    )
+
+
+# (heading, formatter, gestalt key) for the list-backed dossier sections, in order
+LIST_SECTIONS = (
+    ("Key Strengths", format_strengths_table, "key_strengths"),
+    ("Concerns", format_concerns, "concerns"),
+    ("Elite Signals", format_elite_signals, "elite_signals"),
+    ("Business Impact", format_business_impact, "business_impact"),
+)
 
 
 def get_next_steps(decision, confidence, has_clarification_questions):
@@ -138,125 +159,109 @@ def get_next_steps(decision, confidence, has_clarification_questions):
         return ["Unknown decision type — manual review required"]
 
 
-def generate_dossier_md(gestalt, quick_test, fields):
-    """Generate human-readable dossier markdown."""
-    lines = []
-    
-    # Header
-    name = fields.get("name", "Unknown")
-    lines.append(f"# Candidate Dossier: {name}")
-    lines.append("")
-    lines.append(f"**Decision:** {gestalt.get('decision', 'UNKNOWN')}")
-    lines.append(f"**Confidence:** {gestalt.get('confidence', 'unknown')}")
-    lines.append(f"**Date:** {gestalt.get('timestamp', datetime.now(UTC).isoformat())}")
-    lines.append(f"**Quick Test:** {quick_test.get('status', 'unknown')}")
-    lines.append("")
-    
-    # Executive Summary
-    lines.append("## Executive Summary")
-    lines.append("")
-    lines.append(gestalt.get("overall_narrative", "No narrative available"))
-    lines.append("")
-    
-    # Key Strengths
-    lines.append("## Key Strengths")
-    lines.append("")
-    lines.extend(format_strengths_table(gestalt.get("key_strengths", [])))
-    lines.append("")
-    
-    # Concerns
-    lines.append("## Concerns")
-    lines.append("")
-    lines.extend(format_concerns(gestalt.get("concerns", [])))
-    lines.append("")
-    
-    # Elite Signals
-    lines.append("## Elite Signals")
-    lines.append("")
-    lines.extend(format_elite_signals(gestalt.get("elite_signals", [])))
-    lines.append("")
-    
-    # Business Impact
-    lines.append("## Business Impact")
-    lines.append("")
-    lines.extend(format_business_impact(gestalt.get("business_impact", [])))
-    lines.append("")
-    
-    # AI Detection
+def iter_dossier_sections(gestalt, quick_test, fields, next_steps, timestamp=None):
+    """Yield dossier markdown sections lazily, in document order."""
+    decision = gestalt.get("decision", "UNKNOWN")
+    confidence = gestalt.get("confidence", "unknown")
     ai_det = gestalt.get("ai_detection", {})
-    lines.append("## AI Detection")
-    lines.append("")
-    lines.append(f"**Likelihood:** {ai_det.get('likelihood', 'unknown')}")
-    lines.append(f"**Confidence:** {ai_det.get('confidence', 0):.2f}")
-    if ai_det.get("flags"):
-        lines.append(f"**Flags:** {', '.join(ai_det['flags'])}")
-    else:
-        lines.append("**Flags:** None")
+    clarification_q = gestalt.get("clarification_questions")
+    if next_steps is None:
+        next_steps = get_next_steps(decision, confidence, bool(clarification_q))
+    if "timestamp" in gestalt:
+        timestamp = gestalt["timestamp"]
+    elif timestamp is None:
+        timestamp = utc_timestamp()
+
+    yield (
+        f"# Candidate Dossier: {fields.get('name', 'Unknown')}\n"
+        f"\n"
+        f"**Decision:** {decision}\n"
+        f"**Confidence:** {confidence}\n"
+        f"**Date:** {timestamp}\n"
+        f"**Quick Test:** {quick_test.get('status', 'unknown')}"
+    )
+    yield f"## Executive Summary\n\n{gestalt.get('overall_narrative', 'No narrative available')}"
+    for title, fmt, key in LIST_SECTIONS:
+        yield f"## {title}\n\n{fmt(gestalt.get(key, []))}"
     
     scores = ai_det.get("scores", {})
+    ai_scores = ""
     if scores:
-        lines.append("")
-        lines.append("**Scores:**")
-        lines.append(f"- Burstiness: {scores.get('burstiness', 0):.2f}")
-        lines.append(f"- Generic phrases: {scores.get('generic_phrase_count', 0)}")
-        lines.append(f"- Specificity: {scores.get('specificity', 0):.2f}")
-    lines.append("")
+        ai_scores = (
+            "\n\n**Scores:**\n"
+            f"- Burstiness: {scores.get('burstiness', 0):.2f}\n"
+            f"- Generic phrases: {scores.get('generic_phrase_count', 0)}\n"
+            f"- Specificity: {scores.get('specificity', 0):.2f}"
+        )
+    flags = ai_det.get("flags")
+    yield (
+        f"## AI Detection\n"
+        f"\n"
+        f"**Likelihood:** {ai_det.get('likelihood', 'unknown')}\n"
+        f"**Confidence:** {ai_det.get('confidence', 0):.2f}\n"
+        f"**Flags:** {', '.join(flags) if flags else 'None'}"
+        f"{ai_scores}"
+    )
     
-    # Interview Focus
     interview_focus = gestalt.get("interview_focus")
     if interview_focus:
-        lines.append("## Interview Focus")
-        lines.append("")
-        for focus in interview_focus:
-            lines.append(f"- {focus}")
-        lines.append("")
+        focus_items = "\n".join(f"- {focus}" for focus in interview_focus)
+        yield f"## Interview Focus\n\n{focus_items}"
     
-    # Clarification Questions
-    clarification_q = gestalt.get("clarification_questions")
     if clarification_q:
-        lines.append("## Clarification Questions")
-        lines.append("")
-        lines.append("*Send these questions to the candidate before scheduling interview:*")
-        lines.append("")
-        for i, q in enumerate(clarification_q, 1):
-            lines.append(f"{i}. {q}")
-        lines.append("")
+        questions = "\n".join(f"{i}. {q}" for i, q in enumerate(clarification_q, 1))
+        yield (
+            "## Clarification Questions\n"
+            "\n"
+            "*Send these questions to the candidate before scheduling interview:*\n"
+            "\n"
+            f"{questions}"
+        )
     
-    # Next Steps
-    lines.append("## Next Steps")
-    lines.append("")
-    has_clarification = bool(clarification_q)
-    next_steps = get_next_steps(
-        gestalt.get("decision", "UNKNOWN"),
-        gestalt.get("confidence", "unknown"),
-        has_clarification
+    yield "## Next Steps\n\n" + "\n".join(next_steps)
+    yield "---"
+    yield (
+        f"## Contact Information\n"
+        f"\n"
+        f"**Name:** {fields.get('name', 'N/A')}\n"
+        f"**Email:** {fields.get('email', 'N/A')}\n"
+        f"**Phone:** {fields.get('phone', 'N/A')}"
     )
-    lines.extend(next_steps)
-    lines.append("")
-    
-    # Contact Info
-    lines.append("---")
-    lines.append("")
-    lines.append("## Contact Information")
-    lines.append("")
-    lines.append(f"**Name:** {fields.get('name', 'N/A')}")
-    lines.append(f"**Email:** {fields.get('email', 'N/A')}")
-    lines.append(f"**Phone:** {fields.get('phone', 'N/A')}")
-    lines.append("")
+
+
+def generate_dossier_md(gestalt, quick_test, fields, next_steps=None, max_bytes=None, timestamp=None):
+    """Generate human-readable dossier markdown.
+
+    With max_bytes set, rendering stops after the first section that pushes
+    the document past that size, so previews skip the remaining sections.
+    """
+    sections = []
+    size = 0
+    for section in iter_dossier_sections(gestalt, quick_test, fields, next_steps, timestamp):
+        # Running length of the joined document: separator (or trailing newline) + section
+        size += len(section) + (2 if sections else 1)
+        sections.append(section)
+        if max_bytes is not None and size > max_bytes:
+            break
     
-    return "\n".join(lines)
+    return "\n\n".join(sections) + "\n"
 
 
-def generate_dossier_json(gestalt, quick_test, fields, candidate_id, job_id):
+def generate_dossier_json(gestalt, quick_test, fields, candidate_id, job_id, next_steps=None, timestamp=None):
     """Generate machine-readable dossier JSON."""
+    decision = gestalt.get("decision", "UNKNOWN")
+    confidence = gestalt.get("confidence", "unknown")
+    has_clarification = bool(gestalt.get("clarification_questions"))
+    if next_steps is None:
+        next_steps = get_next_steps(decision, confidence, has_clarification)
     strengths = gestalt.get("key_strengths", [])
     concerns = gestalt.get("concerns", [])
     
     return {
         "candidate_id": candidate_id,
         "job_id": job_id,
-        "decision": gestalt.get("decision", "UNKNOWN"),
-        "confidence": gestalt.get("confidence", "unknown"),
+        "decision": decision,
+        "confidence": confidence,
         "quick_test_status": quick_test.get("status", "unknown"),
         "gestalt_summary": gestalt.get("overall_narrative", ""),
         "top_3_strengths": [
@@ -268,18 +273,14 @@ def generate_dossier_json(gestalt, quick_test, fields, candidate_id, job_id):
         "elite_signal_count": len(gestalt.get("elite_signals", [])),
         "business_impact_count": len(gestalt.get("business_impact", [])),
         "ai_detection_likelihood": gestalt.get("ai_detection", {}).get("likelihood", "unknown"),
-        "has_clarification_questions": bool(gestalt.get("clarification_questions")),
-        "recommended_action": get_next_steps(
-            gestalt.get("decision", "UNKNOWN"),
-            gestalt.get("confidence", "unknown"),
-            bool(gestalt.get("clarification_questions"))
-        )[0],
+        "has_clarification_questions": has_clarification,
+        "recommended_action": next_steps[0],
         "contact": {
             "name": fields.get("name", "N/A"),
             "email": fields.get("email", "N/A"),
             "phone": fields.get("phone", "N/A")
         },
-        "timestamp": datetime.now(UTC).isoformat()
+        "timestamp": timestamp or utc_timestamp()
     }
 
 
@@ -289,6 +290,7 @@ def main():
     ap.add_argument("--candidate", required=True, help="Candidate ID")
     ap.add_argument("--dry-run", action="store_true", help="Preview without writing files")
     args = ap.parse_args()
+    run_ts = utc_timestamp()
 
     root = Path(__file__).resolve().parents[2]
     cdir = root / "jobs" / args.job / "candidates" / args.candidate
@@ -316,35 +318,48 @@ def main():
     fields = read_json(fields_path) or {"name": "Unknown", "email": "N/A", "phone": "N/A"}
     
     # Generate outputs
-    logger.info(f"Generating dossier for {args.candidate} (decision: {gestalt.get('decision', 'UNKNOWN')})")
-    
-    dossier_md = generate_dossier_md(gestalt, quick_test, fields)
-    dossier_json = generate_dossier_json(gestalt, quick_test, fields, args.candidate, args.job)
+    decision = gestalt.get("decision", "UNKNOWN")
+    logger.info(f"Generating dossier for {args.candidate} (decision: {decision})")
     
+    next_steps = get_next_steps(
+        decision,
+        gestalt.get("confidence", "unknown"),
+        bool(gestalt.get("clarification_questions"))
+    )
     if args.dry_run:
+        dossier_md = generate_dossier_md(
+            gestalt, quick_test, fields, next_steps, max_bytes=PREVIEW_BYTES, timestamp=run_ts
+        )
         logger.info("[DRY RUN] Would write:")
         logger.info(f"  - {outputs / 'dossier.md'}")
         logger.info(f"  - {outputs / 'dossier.json'}")
         logger.info("")
         logger.info("Preview of dossier.md:")
         logger.info("=" * 60)
-        logger.info(dossier_md[:500] + "..." if len(dossier_md) > 500 else dossier_md)
+        logger.info(dossier_md[:PREVIEW_BYTES] + "..." if len(dossier_md) > PREVIEW_BYTES else dossier_md)
         logger.info("=" * 60)
         return 0
     
+    dossier_md = generate_dossier_md(gestalt, quick_test, fields, next_steps, timestamp=run_ts)
+    dossier_json = generate_dossier_json(
+        gestalt, quick_test, fields, args.candidate, args.job, next_steps, timestamp=run_ts
+    )
+    
     # Write outputs
     outputs.mkdir(parents=True, exist_ok=True)
     (outputs / "dossier.md").write_text(dossier_md)
-    (outputs / "dossier.json").write_text(json.dumps(dossier_json, indent=2))
+    dossier_json_bytes = dumps_json(dossier_json)
+    (outputs / "dossier.json").write_bytes(dossier_json_bytes)
     
     logger.info(f"✓ Dossier written to {outputs}")
     logger.info(f"  - dossier.md ({len(dossier_md)} bytes)")
-    logger.info(f"  - dossier.json ({len(json.dumps(dossier_json))} bytes)")
+    logger.info(f"  - dossier.json ({len(dossier_json_bytes)} bytes)")
     
     return 0
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
     try:
         exit(main())
     except Exception as e:
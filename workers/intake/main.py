@@ -33,13 +33,18 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 logger = logging.getLogger("email_intake")
 
 ALLOWED_EXTS = {".pdf", ".docx", ".md", ".json"}
 KEYWORDS = {"resume", "cv", "cover", "coverletter", "letter", "application", "portfolio", "profile"}
 ET_TZ = ZoneInfo("America/New_York")
 CROCKFORD32 = "0123456789abcdefghjkmnpqrstvwxyz"  # lowercase variant, no i/l/o/u
+_CROCKFORD32_SHIFTS = (35, 30, 25, 20, 15, 10, 5, 0)
 
 
 @dataclass
@@ -48,6 +53,7 @@ class FileInfo:
     stem: str
     ext: str
     mtime_et: datetime  # timezone-aware
+    size_bytes: int
 
 
 @dataclass
@@ -67,7 +73,14 @@ class CandidateGroup:
 # ---------- Helpers ----------
 
 def iso_utc_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def dumps_json(obj) -> bytes:
+    """Serialize obj as 2-space indented JSON bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
 
 
 def to_et(ts: float) -> datetime:
@@ -76,26 +89,28 @@ def to_et(ts: float) -> datetime:
 
 def list_allowed_files(src: Path) -> List[FileInfo]:
     items: List[FileInfo] = []
-    for p in sorted(src.iterdir()):
-        if not p.is_file():
+    # DirEntry caches stat results, so each file is stat'ed once here and the
+    # size travels with the FileInfo instead of being re-read from disk later.
+    with os.scandir(src) as it:
+        entries = sorted(it, key=lambda e: e.name)
+    for entry in entries:
+        if entry.name.startswith('.'):
             continue
-        if p.name.startswith('.'):
+        if not entry.is_file():
             continue
+        p = Path(entry.path)
         ext = p.suffix.lower()
         if ext not in ALLOWED_EXTS:
             logger.debug(f"Skipping disallowed file type: {p}")
             continue
-        items.append(FileInfo(path=p, stem=p.stem, ext=ext, mtime_et=to_et(p.stat().st_mtime)))
+        st = entry.stat()
+        items.append(FileInfo(path=p, stem=p.stem, ext=ext, mtime_et=to_et(st.st_mtime), size_bytes=st.st_size))
     return items
 
 
 def crockford32_encode_40bits(n: int) -> str:
     # Encodes lower 40 bits of n into 8 Crockford base32 chars (8 * 5 = 40)
-    out = []
-    for i in range(8):
-        idx = (n >> (35 - 5 * i)) & 0x1F
-        out.append(CROCKFORD32[idx])
-    return "".join(out)
+    return "".join(CROCKFORD32[(n >> s) & 0x1F] for s in _CROCKFORD32_SHIFTS)
 
 
 def gen_shortid() -> str:
@@ -267,26 +282,22 @@ def unique_dest_path(raw_dir: Path, basename: str) -> Path:
         i += 1
 
 
-def write_metadata(cand_dir: Path, group: CandidateGroup) -> None:
+def write_metadata(cand_dir: Path, group: CandidateGroup, stored: Dict[str, Path], created_at: Optional[str] = None) -> None:
+    # stored maps original name -> where ingest put it (after any suffixing), so
+    # no stored copy is looked up on disk; sizes come from the scandir pass.
     files_meta = []
     for fi in group.files:
-        dest_path = cand_dir / "raw" / fi.path.name
-        # account for potential suffixing; if not found, try to match by stem
-        if not dest_path.exists():
-            # find any file with same stem
-            matches = list((cand_dir / "raw").glob(f"{fi.path.stem}*{fi.path.suffix}"))
-            if matches:
-                dest_path = matches[0]
+        dest_path = stored.get(fi.path.name)
         files_meta.append({
             "original_name": fi.path.name,
-            "stored_relpath": str(dest_path.relative_to(cand_dir)),
-            "size_bytes": dest_path.stat().st_size if dest_path.exists() else None,
+            "stored_relpath": str((dest_path or cand_dir / "raw" / fi.path.name).relative_to(cand_dir)),
+            "size_bytes": fi.size_bytes if dest_path is not None else None,
         })
     meta = {
         "id": group.shortid,
         "slug": group.slug,
         "job": None,  # filled by caller
-        "created_at": iso_utc_now(),
+        "created_at": created_at or iso_utc_now(),
         "name": {
             "first": None,  # Night 1: unknown unless JSON provided per-file; keep None
             "last": None,
@@ -296,7 +307,7 @@ def write_metadata(cand_dir: Path, group: CandidateGroup) -> None:
         "source": {"action": group.source_action},
         "files": files_meta,
     }
-    (cand_dir / "metadata.json").write_text(json.dumps(meta, indent=2))
+    (cand_dir / "metadata.json").write_bytes(dumps_json(meta))
 
 
 def perform_ingest(job: str, src: Path, do_move: bool, dry_run: bool) -> int:
@@ -333,6 +344,7 @@ def perform_ingest(job: str, src: Path, do_move: bool, dry_run: bool) -> int:
         return 0
 
     # Execute
+    created_at = iso_utc_now()  # one timestamp for the whole ingest run
     successes = 0
     failures = 0
     for g in groups:
@@ -343,6 +355,7 @@ def perform_ingest(job: str, src: Path, do_move: bool, dry_run: bool) -> int:
         except FileExistsError:
             # If already exists, we will continue but avoid overwriting files
             raw_dir.mkdir(parents=True, exist_ok=True)
+        stored: Dict[str, Path] = {}
         for fi in g.files:
             try:
                 dest = unique_dest_path(raw_dir, fi.path.name)
@@ -353,17 +366,18 @@ def perform_ingest(job: str, src: Path, do_move: bool, dry_run: bool) -> int:
                 if not dest.exists() or dest.stat().st_size <= 0:
                     raise RuntimeError("Destination missing or empty after operation")
                 logger.info(f"OK: {fi.path.name} -> {dest}")
+                stored[fi.path.name] = dest
                 successes += 1
             except Exception as e:
                 logger.error(f"Fail: {fi.path} -> {raw_dir} :: {e}", exc_info=True)
                 failures += 1
         try:
-            write_metadata(cand_dir, g)
+            write_metadata(cand_dir, g, stored, created_at)
             # patch job into metadata
             meta_path = cand_dir / "metadata.json"
-            m = json.loads(meta_path.read_text())
+            m = json.loads(meta_path.read_bytes())
             m["job"] = job
-            meta_path.write_text(json.dumps(m, indent=2))
+            meta_path.write_bytes(dumps_json(m))
         except Exception as e:
             logger.error(f"Failed to write metadata for {g.slug}: {e}", exc_info=True)
             failures += 1
@@ -407,4 +421,5 @@ def main() -> int:
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
     sys.exit(main())
@@ -9,16 +9,27 @@ Usage:
   python workers/maybe_email/batch.py --job <job-id> [--dry-run]
   python workers/maybe_email/batch.py --all-jobs [--dry-run]
 """
-import argparse, json, logging, subprocess
+import argparse, json, logging, multiprocessing, os, sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+from main import compose_for_candidate
+# Appended, not prepended: scoring/ has its own main.py
+sys.path.append(str(Path(__file__).parent.parent / "scoring"))
+from gestalt_decision import read_decision
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s", datefmt="%Y-%m-%dT%H:%M:%S")
 logger = logging.getLogger(__name__)
 
 ROOT = Path(__file__).resolve().parents[2]
 JOBS_DIR = ROOT / "jobs"
-MAIN = ROOT / "workers" / "maybe_email" / "main.py"
 
 
 def list_jobs() -> list[Path]:
@@ -27,65 +38,116 @@ def list_jobs() -> list[Path]:
 
 def read_json(p: Path) -> dict | None:
     try:
-        return json.loads(p.read_text(encoding="utf-8"))
+        if orjson is not None:
+            return orjson.loads(p.read_bytes())
+        with open(p, "rb") as f:
+            return json.load(f)
     except Exception:
         return None
 
 
-def append_manifest(job_dir: Path, candidate_id: str, email_path: Path, dry_run: bool) -> None:
-    approvals_dir = job_dir / "approvals"
-    manifest_path = approvals_dir / "maybe_pending.json"
-    approvals_dir.mkdir(parents=True, exist_ok=True)
-    manifest = []
-    if manifest_path.exists():
-        try:
-            manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
-        except Exception:
-            manifest = []
-    # de-dupe
-    if any(item.get("candidate_id") == candidate_id for item in manifest):
-        logger.info(f"Already in manifest: {candidate_id}")
-        return
-    manifest.append({
-        "candidate_id": candidate_id,
-        "email_path": str(email_path),
-        "status": "pending",
-        "created_at": datetime.utcnow().isoformat() + "Z"
-    })
+def load_manifest(manifest_path: Path) -> dict[str, dict]:
+    """Read the approvals manifest once, keyed by candidate_id."""
+    items = read_json(manifest_path) if manifest_path.exists() else None
+    if not isinstance(items, list):
+        return {}
+    return {item.get("candidate_id"): item for item in items}
+
+
+def save_manifest(manifest_path: Path, manifest: dict[str, dict], dry_run: bool) -> None:
     if dry_run:
         logger.info(f"[DRY RUN] Would update manifest: {manifest_path}")
+        return
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    items = list(manifest.values())
+    if orjson is not None:
+        data = orjson.dumps(items, option=orjson.OPT_INDENT_2)
     else:
-        manifest_path.write_text(json.dumps(manifest, ensure_ascii=False, indent=2), encoding="utf-8")
-        logger.info(f"✓ Manifest updated: {manifest_path}")
+        data = json.dumps(items, ensure_ascii=False, indent=2).encode("utf-8")
+    # Write beside the manifest and swap it in, so an interrupted run never truncates it
+    tmp = manifest_path.with_suffix(".json.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, manifest_path)
+    logger.info(f"✓ Manifest updated: {manifest_path}")
+
+
+def scan_maybe_candidates(candidates_dir: Path, job_id: str, dry_run: bool) -> list[tuple[str, str, bool]]:
+    """Return composer tasks for every candidate whose gestalt decision is MAYBE."""
+    tasks = []
+    # DirEntry.is_dir() is answered from the directory listing, and a missing
+    # gestalt file just reads as no decision, so no per-candidate stat.
+    with os.scandir(candidates_dir) as it:
+        entries = sorted((e for e in it if e.is_dir()), key=lambda e: e.name)
+    for entry in entries:
+        ge = Path(entry.path, "outputs", "gestalt_evaluation.json")
+        if read_decision(ge) != "MAYBE":
+            continue
+        tasks.append((job_id, entry.name, dry_run))
+    return tasks
 
 
-def process_job(job_dir: Path, dry_run: bool) -> int:
+def scan_job(job_dir: Path, dry_run: bool) -> list[tuple[str, str, bool]]:
     candidates_dir = job_dir / "candidates"
     if not candidates_dir.exists():
-        return 0
-    count = 0
-    for cand_dir in sorted(candidates_dir.iterdir()):
-        ge = cand_dir / "outputs" / "gestalt_evaluation.json"
-        if not ge.exists():
-            continue
-        data = read_json(ge)
-        if not data or data.get("decision") != "MAYBE":
-            continue
-        candidate_id = cand_dir.name
-        cmd = ["python", str(MAIN), "--job", job_dir.name, "--candidate", candidate_id]
-        if dry_run:
-            cmd.append("--dry-run")
-        logger.info(f"Running: {' '.join(cmd)}")
-        res = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
-        if res.returncode != 0:
-            logger.error(f"Composer failed for {candidate_id}: {res.stderr or res.stdout}")
-            continue
-        # determine output path
-        email_path = cand_dir / "outputs" / "clarification_email.md"
-        if email_path.exists() or dry_run:
-            append_manifest(job_dir, candidate_id, email_path, dry_run=dry_run)
-            count += 1
-    return count
+        return []
+    return scan_maybe_candidates(candidates_dir, job_dir.name, dry_run)
+
+
+def process_jobs(job_dirs: list[Path], dry_run: bool, created_at: str | None = None) -> dict[str, int]:
+    """Compose MAYBE emails for every job through one shared pool; returns drafts queued per job."""
+    jobs = {job_dir.name: job_dir for job_dir in job_dirs}
+    # Scanning is stat/read I/O, so threads overlap it; composing is CPU work and
+    # goes to a single process pool shared by every job (no nested pools).
+    tasks = []
+    with ThreadPoolExecutor(max_workers=max(1, min(32, len(jobs)))) as ex:
+        futs = {ex.submit(scan_job, job_dir, dry_run): job_id for job_id, job_dir in jobs.items()}
+        for f in as_completed(futs):
+            try:
+                tasks.extend(f.result())
+            except Exception as e:
+                logger.error(f"Job {futs[f]} failed: {e}")
+    counts = dict.fromkeys(jobs, 0)
+    if not tasks:
+        return counts
+    if created_at is None:
+        created_at = datetime.utcnow().isoformat() + "Z"
+    # Each manifest is read once, updated in memory, and written once at the end
+    manifests: dict[str, dict[str, dict]] = {}
+    changed = set()
+    processes = min(len(tasks), os.cpu_count() or 1)
+    logger.info(f"Composing {len(tasks)} MAYBE email(s) across {processes} process(es)")
+    with multiprocessing.Pool(processes) as pool:
+        # imap keeps task order, so each result pairs with the job that queued it
+        for (job_id, _, _), (candidate_id, _, err) in zip(tasks, pool.imap(compose_for_candidate, tasks, chunksize=4)):
+            if err:
+                logger.error(f"Composer failed for {candidate_id}: {err}")
+                continue
+            job_dir = jobs[job_id]
+            # determine output path
+            email_path = job_dir / "candidates" / candidate_id / "outputs" / "clarification_email.md"
+            if not (email_path.exists() or dry_run):
+                continue
+            counts[job_id] += 1
+            if job_id not in manifests:
+                manifests[job_id] = load_manifest(job_dir / "approvals" / "maybe_pending.json")
+            manifest = manifests[job_id]
+            if candidate_id in manifest:
+                logger.info(f"Already in manifest: {candidate_id}")
+                continue
+            manifest[candidate_id] = {
+                "candidate_id": candidate_id,
+                "email_path": str(email_path),
+                "status": "pending",
+                "created_at": created_at
+            }
+            changed.add(job_id)
+    for job_id in changed:
+        save_manifest(jobs[job_id] / "approvals" / "maybe_pending.json", manifests[job_id], dry_run)
+    return counts
+
+
+def process_job(job_dir: Path, dry_run: bool, created_at: str | None = None) -> int:
+    return process_jobs([job_dir], dry_run, created_at)[job_dir.name]
 
 
 def main():
@@ -95,13 +157,15 @@ def main():
     g.add_argument("--all-jobs", action="store_true", help="Scan all jobs")
     parser.add_argument("--dry-run", action="store_true", help="Preview without writing manifests")
     args = parser.parse_args()
+    # One batch-run timestamp shared by every manifest record queued in this run
+    created_at = datetime.utcnow().isoformat() + "Z"
 
     if args.all_jobs:
         total = 0
-        for job in list_jobs():
-            c = process_job(job, dry_run=args.dry_run)
+        counts = process_jobs(list_jobs(), args.dry_run, created_at)
+        for job_id, c in sorted(counts.items()):
             if c:
-                logger.info(f"Job {job.name}: {c} MAYBE drafts queued")
+                logger.info(f"Job {job_id}: {c} MAYBE drafts queued")
             total += c
         logger.info(f"✓ Complete. Total MAYBE drafts queued: {total}")
     else:
@@ -109,7 +173,7 @@ def main():
         if not job_dir.exists():
             logger.error(f"Job not found: {job_dir}")
             return 1
-        c = process_job(job_dir, dry_run=args.dry_run)
+        c = process_job(job_dir, dry_run=args.dry_run, created_at=created_at)
         logger.info(f"✓ Complete. {c} MAYBE drafts queued for {args.job}")
     return 0
 
@@ -8,12 +8,18 @@ Usage:
 """
 
 import argparse
+import functools
 import json
 import logging
 import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)sZ %(levelname)s %(message)s",
@@ -21,13 +27,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Repo root (workers/maybe_email/main.py -> ZoATS/), resolved once at import
+_BASE_DIR = Path(__file__).resolve().parents[2]
+
+JOB_TITLE_LINES = frozenset(['Associate', 'Senior Associate', 'Consultant'])
+
 
 def load_json(path: Path) -> dict:
     """Load and parse JSON file."""
     if not path.exists():
         raise FileNotFoundError(f"Required file not found: {path}")
     
-    with open(path, 'r', encoding='utf-8') as f:
+    if orjson is not None:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'rb') as f:
         return json.load(f)
 
 
@@ -42,9 +55,14 @@ def get_candidate_info(candidate_dir: Path) -> dict:
     }
 
 
-def get_job_info(job_dir: Path) -> dict:
-    """Extract job title and company from job description."""
-    job_desc_path = job_dir / "job-description.md"
+@functools.lru_cache(maxsize=32)
+def get_job_info(job_dir: str) -> dict:
+    """Extract job title and company from job description.
+    
+    Cached per job directory (passed as a str so the cache key is stable), so a
+    batch worker parses each job-description.md once. Treat the result as read-only.
+    """
+    job_desc_path = Path(job_dir) / "job-description.md"
     
     if not job_desc_path.exists():
         logger.warning(f"Job description not found at {job_desc_path}, using defaults")
@@ -61,13 +79,13 @@ def get_job_info(job_dir: Path) -> dict:
     title = "Associate"  # Default from our test case
     company = "McKinsey & Company"
     
-    # Try to extract more intelligently
-    lines = content.split('\n')
-    for i, line in enumerate(lines):
-        if line.strip() in ['Associate', 'Senior Associate', 'Consultant']:
-            title = line.strip()
-        if 'McKinsey' in line:
-            company = "McKinsey & Company"
+    # Try to extract more intelligently: the title line sits near the top, so stop at
+    # the first one. (Company already defaults to the only value a match could set.)
+    for line in content.splitlines():
+        stripped = line.strip()
+        if stripped in JOB_TITLE_LINES:
+            title = stripped
+            break
     
     return {
         "title": title,
@@ -112,11 +130,18 @@ hiring@careerspan.com"""
     return email
 
 
-def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
-    """Main execution function."""
+def compose_for_candidate(task: tuple) -> tuple:
+    """Compose the clarification email for one candidate.
+    
+    Takes a (job_id, candidate_id, dry_run) tuple so it can be mapped over a
+    multiprocessing pool. Returns (candidate_id, email_path, error): email_path
+    is the (would-be) output path when an email was composed, None when the
+    candidate was skipped; error is a message on failure, else None.
+    """
+    job_id, candidate_id, dry_run = task
     try:
         # Resolve paths
-        base_dir = Path(__file__).resolve().parent.parent.parent
+        base_dir = _BASE_DIR
         job_dir = base_dir / "jobs" / job_id
         candidate_dir = job_dir / "candidates" / candidate_id
         outputs_dir = candidate_dir / "outputs"
@@ -127,11 +152,11 @@ def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
         # Verify directory structure
         if not candidate_dir.exists():
             logger.error(f"Candidate directory not found: {candidate_dir}")
-            return 1
+            return candidate_id, None, f"Candidate directory not found: {candidate_dir}"
         
         if not outputs_dir.exists():
             logger.error(f"Outputs directory not found: {outputs_dir}")
-            return 1
+            return candidate_id, None, f"Outputs directory not found: {outputs_dir}"
         
         # Load gestalt evaluation
         gestalt_path = outputs_dir / "gestalt_evaluation.json"
@@ -144,7 +169,7 @@ def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
         if decision != "MAYBE":
             logger.info(f"Skipping: Decision is {decision}, not MAYBE")
             logger.info("✓ No clarification email needed")
-            return 0
+            return candidate_id, None, None
         
         # Extract clarification questions
         clarification_questions = gestalt.get("clarification_questions", [])
@@ -152,13 +177,13 @@ def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
         if not clarification_questions:
             logger.warning("MAYBE decision but no clarification_questions provided")
             logger.info("✓ No clarification email generated (no questions)")
-            return 0
+            return candidate_id, None, None
         
         logger.info(f"Found {len(clarification_questions)} clarification questions")
         
         # Get candidate and job info
         candidate_info = get_candidate_info(candidate_dir)
-        job_info = get_job_info(job_dir)
+        job_info = get_job_info(str(job_dir))
         
         logger.info(f"Candidate: {candidate_info['name']} <{candidate_info['email']}>")
         logger.info(f"Position: {job_info['title']} at {job_info['company']}")
@@ -189,7 +214,7 @@ def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
         if dry_run:
             logger.info(f"[DRY RUN] Would write to: {output_path}")
             logger.info("✓ Dry run complete")
-            return 0
+            return candidate_id, output_path, None
         
         with open(output_path, 'w', encoding='utf-8') as f:
             f.write(email_content)
@@ -197,17 +222,23 @@ def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
         logger.info(f"✓ Email saved to: {output_path}")
         logger.info("✓ Complete")
         
-        return 0
+        return candidate_id, output_path, None
         
     except FileNotFoundError as e:
         logger.error(f"File not found: {e}")
-        return 1
+        return candidate_id, None, f"File not found: {e}"
     except json.JSONDecodeError as e:
         logger.error(f"Invalid JSON: {e}")
-        return 1
+        return candidate_id, None, f"Invalid JSON: {e}"
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
-        return 1
+        return candidate_id, None, f"Unexpected error: {e}"
+
+
+def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
+    """Main execution function."""
+    _, _, error = compose_for_candidate((job_id, candidate_id, dry_run))
+    return 1 if error else 0
 
 
 if __name__ == "__main__":
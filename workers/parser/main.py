@@ -4,10 +4,13 @@
 import argparse
 import json
 import logging
+import os
 import re
 import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Iterator, Optional, Tuple
 
 logging.basicConfig(
     level=logging.INFO,
@@ -15,100 +18,265 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Repo root (workers/parser/main.py -> ZoATS/), resolved once at import
+_BASE_DIR = Path(__file__).resolve().parents[2]
+
+# Optional PDF backends, resolved once at import instead of on every call
+try:
+    from pdfminer.high_level import extract_text as _pdfminer_extract_text
+except Exception:
+    _pdfminer_extract_text = None
+
+try:
+    import pypdf
+except Exception:
+    pypdf = None
+
+try:
+    import PyPDF2
+except Exception:
+    PyPDF2 = None
+
+try:
+    import pdfplumber
+except Exception:
+    pdfplumber = None
+
+# Optional: lxml lets DOCX text be streamed straight from word/document.xml
+try:
+    from lxml import etree as _lxml_etree
+except Exception:
+    _lxml_etree = None
+
+
+def _extract_pdfminer(pdf_path: Path) -> str:
+    return _pdfminer_extract_text(str(pdf_path))
+
+
+def _extract_pypdf(pdf_path: Path) -> str:
+    reader = pypdf.PdfReader(str(pdf_path))
+    parts = []
+    for page in reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            parts.append(page_text)
+    return "\n".join(parts)
+
+
+def _extract_pypdf2(pdf_path: Path) -> str:
+    with open(pdf_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        parts = []
+        for page in reader.pages:
+            page_text = page.extract_text()
+            if page_text:
+                parts.append(page_text)
+    return "\n".join(parts)
+
+
+def _extract_pdfplumber(pdf_path: Path) -> str:
+    with pdfplumber.open(pdf_path) as pdf:
+        parts = []
+        for page in pdf.pages:
+            page_text = page.extract_text()
+            if page_text:
+                parts.append(page_text)
+    return "\n".join(parts)
+
+
+# (name, backend module/function or None if unavailable, extractor), in preference order:
+# pdfminer.six (best quality), pypdf, PyPDF2 (legacy), pdfplumber (best for tables)
+_PDF_BACKENDS = (
+    ("pdfminer.six", _pdfminer_extract_text, _extract_pdfminer),
+    ("pypdf", pypdf, _extract_pypdf),
+    ("PyPDF2", PyPDF2, _extract_pypdf2),
+    ("pdfplumber", pdfplumber, _extract_pdfplumber),
+)
+_PDF_STRATEGIES = tuple((name, fn) for name, backend, fn in _PDF_BACKENDS if backend is not None)
+_PDF_UNAVAILABLE = tuple(name for name, backend, _ in _PDF_BACKENDS if backend is None)
+
+
+# Which backend last produced text for PDFs from a given producer (Google Docs,
+# Word, macOS Quartz, ...). Tried first next time; persisted across runs.
+_BACKEND_CACHE_PATH = Path.home() / ".cache" / "zoats" / "pdf_backends.json"
+_BACKEND_HISTORY: Optional[Dict[str, str]] = None
+_PRODUCER_RE = re.compile(rb'/Producer\s*\(([^)]{1,200})\)')
+_PRODUCER_SNIFF_BYTES = 2048
+
+
+def _pdf_head(pdf_path: Path) -> bytes:
+    with open(pdf_path, 'rb') as f:
+        return f.read(_PRODUCER_SNIFF_BYTES)
+
+
+def _pdf_producer(pdf_path: Path, head: bytes) -> str:
+    """Cheap producer sniff: the Info dict sits near either the start or the end of the file."""
+    m = _PRODUCER_RE.search(head)
+    if not m and len(head) == _PRODUCER_SNIFF_BYTES:
+        try:
+            with open(pdf_path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                f.seek(max(len(head), f.tell() - _PRODUCER_SNIFF_BYTES))
+                m = _PRODUCER_RE.search(f.read())
+        except OSError:
+            return ""
+    return m.group(1).decode('latin-1') if m else ""
+
+
+def _backend_history() -> Dict[str, str]:
+    global _BACKEND_HISTORY
+    if _BACKEND_HISTORY is None:
+        try:
+            _BACKEND_HISTORY = json.loads(_BACKEND_CACHE_PATH.read_text(encoding='utf-8'))
+        except Exception:
+            _BACKEND_HISTORY = {}
+    return _BACKEND_HISTORY
+
+
+def _remember_backend(producer: str, name: str) -> None:
+    history = _backend_history()
+    if history.get(producer) == name:
+        return
+    history[producer] = name
+    try:
+        _BACKEND_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = _BACKEND_CACHE_PATH.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(history, indent=2), encoding='utf-8')
+        os.replace(tmp, _BACKEND_CACHE_PATH)
+    except OSError as e:
+        logger.debug(f"[PDF] Could not persist backend cache: {e}")
+
+
+# Above this size a slow backend (huge images, odd encodings) can dominate, so
+# all backends race in threads and the first to return text wins
+_PARALLEL_PDF_BYTES = 1024 * 1024
+
+
+def _pdf_attempts(pdf_path: Path, ordered, parallel: bool) -> Iterator[Tuple[str, Optional[str], Optional[Exception]]]:
+    """Yield (name, text, error) per backend: in preference order, or as they finish when parallel."""
+    if not parallel:
+        for name, extract in ordered:
+            logger.info(f"[PDF] Trying {name} for {pdf_path.name}")
+            try:
+                yield name, extract(pdf_path), None
+            except Exception as e:
+                yield name, None, e
+        return
+    
+    logger.info(f"[PDF] Trying {', '.join(name for name, _ in ordered)} in parallel for {pdf_path.name}")
+    ex = ThreadPoolExecutor(max_workers=len(ordered))
+    try:
+        futs = {ex.submit(extract, pdf_path): name for name, extract in ordered}
+        for f in as_completed(futs):
+            try:
+                yield futs[f], f.result(), None
+            except Exception as e:
+                yield futs[f], None, e
+    finally:
+        # Don't wait on the losers; threads can't be interrupted, so they finish in the background
+        ex.shutdown(wait=False, cancel_futures=True)
+
 
 def extract_pdf_text(pdf_path: Path) -> str:
     """Extract text from PDF with multiple fallback strategies."""
-    strategies = []
-    
-    # Strategy 1: pdfminer.six (best quality)
+    # Validate the header up front so non-PDFs (HTML error pages, renamed
+    # documents) fail fast instead of going through every backend first.
+    # Readers tolerate a little junk before the marker, so look in the first 1 KB.
     try:
-        from pdfminer.high_level import extract_text
-        logger.info(f"[PDF] Trying pdfminer.six for {pdf_path.name}")
-        text = extract_text(str(pdf_path))
-        if text and len(text.strip()) > 0:
-            logger.info(f"[PDF] ✓ pdfminer.six extracted {len(text)} chars")
-            return text.strip()
-        strategies.append("pdfminer.six (no text)")
-    except Exception as e:
-        strategies.append(f"pdfminer.six ({type(e).__name__})")
-        logger.debug(f"[PDF] pdfminer.six failed: {e}")
+        head = _pdf_head(pdf_path)
+        size = pdf_path.stat().st_size
+    except OSError as e:
+        logger.error(f"[PDF] Could not read file header: {e}")
+        return ""
+    if head.find(b'%PDF-', 0, 1024) == -1:
+        logger.error(f"[PDF] File does not have valid PDF header: {head[:20]}")
+        return ""
     
-    # Strategy 2: pypdf
-    try:
-        import pypdf
-        logger.info(f"[PDF] Trying pypdf for {pdf_path.name}")
-        reader = pypdf.PdfReader(str(pdf_path))
-        text = ""
-        for i, page in enumerate(reader.pages):
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        if text and len(text.strip()) > 0:
-            logger.info(f"[PDF] ✓ pypdf extracted {len(text)} chars from {len(reader.pages)} page(s)")
-            return text.strip()
-        strategies.append("pypdf (no text)")
-    except Exception as e:
-        strategies.append(f"pypdf ({type(e).__name__})")
-        logger.debug(f"[PDF] pypdf failed: {e}")
+    strategies = [f"{name} (not installed)" for name in _PDF_UNAVAILABLE]
     
-    # Strategy 3: PyPDF2 (legacy)
-    try:
-        import PyPDF2
-        logger.info(f"[PDF] Trying PyPDF2 for {pdf_path.name}")
-        with open(pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        if text and len(text.strip()) > 0:
-            logger.info(f"[PDF] ✓ PyPDF2 extracted {len(text)} chars")
-            return text.strip()
-        strategies.append("PyPDF2 (no text)")
-    except Exception as e:
-        strategies.append(f"PyPDF2 ({type(e).__name__})")
-        logger.debug(f"[PDF] PyPDF2 failed: {e}")
+    producer = _pdf_producer(pdf_path, head)
+    preferred = _backend_history().get(producer)
+    ordered = sorted(_PDF_STRATEGIES, key=lambda s: s[0] != preferred)  # stable: preferred first
     
-    # Strategy 4: pdfplumber (optional, best for tables)
+    parallel = len(ordered) > 1 and size > _PARALLEL_PDF_BYTES
+    attempts = _pdf_attempts(pdf_path, ordered, parallel)
     try:
-        import pdfplumber
-        logger.info(f"[PDF] Trying pdfplumber for {pdf_path.name}")
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                page_text = page.extract_text()
-                if page_text:
-                    text += page_text + "\n"
-        if text and len(text.strip()) > 0:
-            logger.info(f"[PDF] ✓ pdfplumber extracted {len(text)} chars")
-            return text.strip()
-        strategies.append("pdfplumber (no text)")
-    except ImportError:
-        strategies.append("pdfplumber (not installed)")
-    except Exception as e:
-        strategies.append(f"pdfplumber ({type(e).__name__})")
-        logger.debug(f"[PDF] pdfplumber failed: {e}")
+        for name, text, error in attempts:
+            if error is not None:
+                strategies.append(f"{name} ({type(error).__name__})")
+                logger.debug(f"[PDF] {name} failed: {error}")
+            elif text and len(text.strip()) > 0:
+                logger.info(f"[PDF] ✓ {name} extracted {len(text)} chars")
+                _remember_backend(producer, name)
+                return text.strip()
+            else:
+                strategies.append(f"{name} (no text)")
+    finally:
+        attempts.close()
     
     # All strategies failed
     logger.error(f"[PDF] All extraction strategies failed for {pdf_path.name}")
     logger.error(f"[PDF] Tried: {', '.join(strategies)}")
-    
-    # Check if file is valid PDF
-    try:
-        with open(pdf_path, 'rb') as f:
-            header = f.read(8)
-            if not header.startswith(b'%PDF'):
-                logger.error(f"[PDF] File does not have valid PDF header: {header[:20]}")
-                return ""
-    except Exception as e:
-        logger.error(f"[PDF] Could not read file header: {e}")
-    
     return ""
 
 
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+# Run children and their text equivalents, as python-docx renders Run.text
+# (w:t carries text; w:br only counts as "\n" when it is a line break)
+_DOCX_RUN_TEXT = {f'{_W}tab': '\t', f'{_W}ptab': '\t', f'{_W}cr': '\n', f'{_W}noBreakHyphen': '-'}
+
+
+def _docx_run_text(run) -> str:
+    parts = []
+    for child in run:
+        tag = child.tag
+        if tag == f'{_W}t':
+            parts.append(child.text or '')
+        elif tag == f'{_W}br':
+            if child.get(f'{_W}type', 'textWrapping') == 'textWrapping':
+                parts.append('\n')
+        elif tag in _DOCX_RUN_TEXT:
+            parts.append(_DOCX_RUN_TEXT[tag])
+    return ''.join(parts)
+
+
+def _docx_paragraph_text(p) -> str:
+    parts = []
+    for child in p:
+        if child.tag == f'{_W}r':
+            parts.append(_docx_run_text(child))
+        elif child.tag == f'{_W}hyperlink':
+            parts.extend(_docx_run_text(r) for r in child if r.tag == f'{_W}r')
+    return ''.join(parts)
+
+
+def _stream_docx_text(docx_path: Path) -> str:
+    """Stream body paragraphs out of word/document.xml without building a python-docx DOM.
+
+    Matches python-docx's "\n".join(p.text for p in doc.paragraphs): only top-level body
+    paragraphs count (table cells and text boxes are skipped).
+    """
+    paragraphs = []
+    with zipfile.ZipFile(docx_path) as z, z.open('word/document.xml') as f:
+        for _, el in _lxml_etree.iterparse(f, events=('end',), tag=f'{_W}p'):
+            parent = el.getparent()
+            if parent is None or parent.tag != f'{_W}body':
+                continue
+            paragraphs.append(_docx_paragraph_text(el))
+            # Free what has been consumed: this paragraph and any earlier body children
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
+    return "\n".join(paragraphs)
+
+
 def extract_docx_text(docx_path: Path) -> str:
-    """Extract text from DOCX using python-docx."""
+    """Extract text from DOCX, streaming the XML with lxml when available, else via python-docx."""
+    if _lxml_etree is not None:
+        try:
+            return _stream_docx_text(docx_path).strip()
+        except Exception as e:
+            logger.debug(f"DOCX streaming extraction failed, falling back to python-docx: {e}")
     try:
         from docx import Document
         doc = Document(docx_path)
@@ -146,54 +314,59 @@ def extract_text_from_file(file_path: Path) -> str:
         return ""
 
 
+# Field-extraction patterns, compiled once per process
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+_YRS_EXP_RES = tuple(re.compile(p, re.IGNORECASE) for p in (
+    r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
+    r'experience[:\s]+(\d+)\+?\s*years?',
+))
+_DATE_RANGE_RE = re.compile(r'(20\d{2})\s*[-–—]\s*(20\d{2}|present)', re.IGNORECASE)
+# A line with at least one non-space character ('.' never crosses a newline)
+_NONBLANK_LINE_RE = re.compile(r'^.*\S.*$', re.MULTILINE)
+
+
 def extract_email(text: str) -> Optional[str]:
     """Best-effort email extraction using regex."""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    matches = re.findall(email_pattern, text)
-    return matches[0] if matches else None
+    m = _EMAIL_RE.search(text)
+    return m.group(0) if m else None
 
 
 def extract_name(text: str) -> Optional[str]:
     """Best-effort name extraction from first few lines."""
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    if not lines:
-        return None
-    
-    # Simple heuristic: first non-empty line that looks like a name
-    # (short, mostly letters, capitalized)
-    for line in lines[:5]:
+    # Walk only the first 5 non-empty lines instead of splitting the whole resume
+    first = None
+    for i, m in enumerate(_NONBLANK_LINE_RE.finditer(text)):
+        if i == 5:
+            break
+        line = m.group().strip()
+        if first is None:
+            first = line
+        # Simple heuristic: first non-empty line that looks like a name
+        # (short, mostly letters, capitalized)
         words = line.split()
         if 2 <= len(words) <= 4 and len(line) < 50:
-            if all(word[0].isupper() for word in words if word):
+            if all(word[0].isupper() for word in words):
                 return line
     
-    return lines[0] if lines else None
+    return first
 
 
 def estimate_years_experience(text: str) -> Optional[int]:
     """Heuristic years of experience estimation."""
     # Look for explicit mentions like "5 years", "5+ years", etc.
-    patterns = [
-        r'(\d+)\+?\s*years?\s+(?:of\s+)?experience',
-        r'experience[:\s]+(\d+)\+?\s*years?',
-    ]
-    
-    for pattern in patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        if matches:
-            try:
-                return int(matches[0])
-            except:
-                pass
+    for pattern in _YRS_EXP_RES:
+        m = pattern.search(text)
+        if m:
+            return int(m.group(1))
     
     # Fallback: count year ranges (YYYY-YYYY or YYYY-Present)
-    date_ranges = re.findall(r'(20\d{2})\s*[-–—]\s*(20\d{2}|present)', text, re.IGNORECASE)
-    if date_ranges:
-        total_years = 0
-        for start, end in date_ranges:
-            start_year = int(start)
-            end_year = 2025 if end.lower() == 'present' else int(end)
-            total_years += max(0, end_year - start_year)
+    total_years = None
+    for m in _DATE_RANGE_RE.finditer(text):
+        start, end = m.groups()
+        start_year = int(start)
+        end_year = 2025 if end.lower() == 'present' else int(end)
+        total_years = (total_years or 0) + max(0, end_year - start_year)
+    if total_years is not None:
         return min(total_years, 50)  # Cap at reasonable maximum
     
     return None
@@ -208,9 +381,31 @@ def extract_fields(text: str) -> Dict:
     }
 
 
+# Resume file types by preference (lower wins)
+_RESUME_EXT_RANK = {'.pdf': 0, '.docx': 1, '.md': 2, '.markdown': 2}
+
+
+def find_resume_file(raw_dir: Path) -> Optional[Path]:
+    """Pick the resume in raw_dir with a single directory scan (PDF > DOCX > Markdown)."""
+    best_rank, best_path = None, None
+    with os.scandir(raw_dir) as it:
+        for entry in it:
+            if entry.name.startswith('.'):
+                continue
+            rank = _RESUME_EXT_RANK.get(os.path.splitext(entry.name)[1].lower())
+            if rank is None or (best_rank is not None and rank >= best_rank):
+                continue
+            if not entry.is_file():
+                continue
+            best_rank, best_path = rank, entry.path
+            if rank == 0:
+                break
+    return Path(best_path) if best_path else None
+
+
 def parse_resume(job: str, candidate_id: str, dry_run: bool = False) -> Tuple[bool, str]:
     """Main parsing logic for a candidate's resume."""
-    base_path = Path("/home/workspace/ZoATS")
+    base_path = _BASE_DIR
     candidate_dir = base_path / "jobs" / job / "candidates" / candidate_id
     raw_dir = candidate_dir / "raw"
     parsed_dir = candidate_dir / "parsed"
@@ -219,14 +414,10 @@ def parse_resume(job: str, candidate_id: str, dry_run: bool = False) -> Tuple[bo
     if not raw_dir.exists():
         return False, f"Raw directory not found: {raw_dir}"
     
-    resume_files = list(raw_dir.glob("*.[pP][dD][fF]")) + \
-                   list(raw_dir.glob("*.[dD][oO][cC][xX]")) + \
-                   list(raw_dir.glob("*.[mM][dD]"))
-    
-    if not resume_files:
+    resume_file = find_resume_file(raw_dir)
+    if resume_file is None:
         return False, f"No resume file found in {raw_dir}"
     
-    resume_file = resume_files[0]
     logger.info(f"Processing: {resume_file}")
     
     # Validate file exists and has content
@@ -1,11 +1,33 @@
 #!/usr/bin/env python3
 """Test suite for resume parser worker."""
 
+import contextlib
+import io
 import json
-import subprocess
+import logging
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+import main as parser_main
+
+
+def run_parser(job_id: str, candidate_id: str) -> tuple[int, str]:
+    """Run the parser in-process, returning (exit code, captured log output)."""
+    buf = io.StringIO()
+    handler = logging.StreamHandler(buf)
+    handler.setFormatter(logging.Formatter("%(asctime)sZ %(levelname)s %(message)s"))
+    parser_main.logger.addHandler(handler)
+    parser_main.logger.propagate = False
+    try:
+        returncode = parser_main.main(job_id, candidate_id)
+    finally:
+        parser_main.logger.removeHandler(handler)
+        parser_main.logger.propagate = True
+    return returncode, buf.getvalue()
+
+
 def run_test(job_id: str, candidate_id: str) -> bool:
     """Run parser on a candidate and validate outputs."""
     print(f"\n{'='*60}")
@@ -13,23 +35,18 @@ def run_test(job_id: str, candidate_id: str) -> bool:
     print('='*60)
     
     # Run parser
-    result = subprocess.run(
-        ["python3", "workers/parser/main.py", "--job", job_id, "--candidate", candidate_id],
-        cwd="/home/workspace/ZoATS",
-        capture_output=True,
-        text=True
-    )
-    
-    if result.returncode != 0:
-        print(f"❌ Parser failed with return code {result.returncode}")
-        print(f"STDERR: {result.stderr}")
+    returncode, output = run_parser(job_id, candidate_id)
+    
+    if returncode != 0:
+        print(f"❌ Parser failed with return code {returncode}")
+        print(f"STDERR: {output}")
         return False
     
     print(f"✓ Parser executed successfully")
-    print(f"Output:\n{result.stderr}")
+    print(f"Output:\n{output}")
     
     # Validate outputs
-    base_path = Path(f"/home/workspace/ZoATS/jobs/{job_id}/candidates/{candidate_id}/parsed")
+    base_path = parser_main._BASE_DIR / "jobs" / job_id / "candidates" / candidate_id / "parsed"
     text_file = base_path / "text.md"
     fields_file = base_path / "fields.json"
     
@@ -86,6 +103,19 @@ def run_test(job_id: str, candidate_id: str) -> bool:
     
     return True
 
+def run_test_captured(test: tuple[str, str]) -> tuple[str, str, bool, str]:
+    """Pool worker: run one test, returning its result and printed report."""
+    job_id, candidate_id = test
+    buf = io.StringIO()
+    with contextlib.redirect_stdout(buf):
+        try:
+            passed = run_test(job_id, candidate_id)
+        except Exception as e:
+            print(f"❌ Test crashed: {e}")
+            passed = False
+    return job_id, candidate_id, passed, buf.getvalue()
+
+
 def main():
     """Run all tests."""
     print("Resume Parser Test Suite")
@@ -96,14 +126,13 @@ def main():
         ("test-job", "vrijen-001"),  # PDF
     ]
     
+    # Each pool worker imports the parser (and its PDF backends) once; reports
+    # are printed in test order once each run finishes.
     results = []
-    for job_id, candidate_id in tests:
-        try:
-            passed = run_test(job_id, candidate_id)
+    with ProcessPoolExecutor(max_workers=len(tests)) as ex:
+        for job_id, candidate_id, passed, report in ex.map(run_test_captured, tests):
+            print(report, end="")
             results.append((job_id, candidate_id, passed))
-        except Exception as e:
-            print(f"❌ Test crashed: {e}")
-            results.append((job_id, candidate_id, False))
     
     # Summary
     print(f"\n{'='*60}")
@@ -4,14 +4,116 @@ LLM-Based Deal Breaker Checking
 
 Checks if resume meets hard requirements using semantic understanding.
 """
+import functools
 import json
 import logging
-import subprocess
+import re
 from typing import Dict, List, Tuple
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
+_YEARS_RE = re.compile(r"(\d+)\+?\s*years?")
+# One scan of the resume for every signal the deal-breaker rules consult. Zero-width
+# lookahead keeps plain substring semantics: a token overlapping another ("h1bachelor")
+# still counts, and a years hit at each digit suffix can never exceed the full number.
+_RESUME_SIGNALS_RE = re.compile(
+    r"(?=(?P<visa>visa|h1b|sponsorship)|(?P<deg>bachelor|master|mba|phd|degree)|(?P<yrs>\d+)\+?\s*years?)"
+)
+
+
+def _resume_signals(resume_lower: str) -> Tuple[bool, bool, int | None]:
+    """(visa mentioned, degree mentioned, max years mentioned or None) in one pass."""
+    visa_hit = deg_hit = False
+    max_years = None
+    for m in _RESUME_SIGNALS_RE.finditer(resume_lower):
+        kind = m.lastgroup
+        if kind == "visa":
+            visa_hit = True
+        elif kind == "deg":
+            deg_hit = True
+        else:
+            years = int(m.group("yrs"))
+            if max_years is None or years > max_years:
+                max_years = years
+    return visa_hit, deg_hit, max_years
+
+
+def _check_deal_breakers_inproc(resume_text: str, deal_breakers: List[str]) -> List[Dict]:
+    """Keyword heuristics for common deal breakers (work authorization, years, degree).
+    
+    Returns: [{requirement: str, violated: bool, confidence: float, reason: str}]
+    """
+    # Only the first 2000 chars are considered, so that is all the cache key needs
+    return _check_deal_breakers_cached(resume_text[:2000], tuple(deal_breakers))
+
+
+@functools.lru_cache(maxsize=256)
+def _check_deal_breakers_cached(resume_head: str, deal_breakers: Tuple[str, ...]) -> List[Dict]:
+    """Cached per (resume head, deal breakers); callers must treat the result as read-only."""
+    visa_hit, deg_hit, max_years = _resume_signals(resume_head.lower())
+    violations = []
+    
+    for db in deal_breakers:
+        db_lower = db.lower()
+        
+        # Check for common deal breakers
+        violated = False
+        reason = ""
+        confidence = 0.7
+        
+        # Work authorization
+        if "authorization" in db_lower or "visa" in db_lower:
+            if visa_hit:
+                violated = True
+                reason = "Likely requires visa sponsorship"
+                confidence = 0.8
+            else:
+                violated = False
+                reason = "No visa issues mentioned"
+        
+        # Years of experience
+        years_match = _YEARS_RE.search(db_lower)
+        if years_match:
+            required_years = int(years_match.group(1))
+            if max_years is not None:
+                if max_years < required_years:
+                    violated = True
+                    reason = f"Has {max_years} years, needs {required_years}+"
+                    confidence = 0.7
+                else:
+                    violated = False
+                    reason = f"Has {max_years}+ years experience"
+            else:
+                violated = True
+                reason = "No years of experience mentioned"
+                confidence = 0.5
+        
+        # Degree requirements
+        if "degree" in db_lower or "mba" in db_lower or "phd" in db_lower:
+            if not deg_hit:
+                violated = True
+                reason = "No degree mentioned"
+                confidence = 0.8
+            else:
+                violated = False
+                reason = "Has degree"
+        
+        # Default: assume not violated if unclear
+        if not reason:
+            violated = False
+            reason = "Unable to determine from resume"
+            confidence = 0.3
+        
+        violations.append({
+            "requirement": db,
+            "violated": violated,
+            "confidence": confidence,
+            "reason": reason
+        })
+    
+    return violations
+
 
 def check_deal_breakers_llm(resume_text: str, deal_breakers: List[str]) -> Tuple[List[Dict], str]:
     """
@@ -51,108 +153,24 @@ Return JSON:
 }}"""
 
     try:
-        result = subprocess.run(
-            ['python3', '-c', f'''
-import json
-import re
-
-resume = """{resume_text[:2000]}"""
-deal_breakers = {deal_breakers}
-
-violations = []
-
-for db in deal_breakers:
-    db_lower = db.lower()
-    resume_lower = resume.lower()
-    
-    # Check for common deal breakers
-    violated = False
-    reason = ""
-    confidence = 0.7
-    
-    # Work authorization
-    if "authorization" in db_lower or "visa" in db_lower:
-        if "visa" in resume_lower or "h1b" in resume_lower or "sponsorship" in resume_lower:
-            violated = True
-            reason = "Likely requires visa sponsorship"
-            confidence = 0.8
-        else:
-            violated = False
-            reason = "No visa issues mentioned"
-    
-    # Years of experience
-    years_match = re.search(r"(\\d+)\\+?\\s*years?", db_lower)
-    if years_match:
-        required_years = int(years_match.group(1))
-        resume_years = re.findall(r"(\\d+)\\+?\\s*years?", resume_lower)
-        if resume_years:
-            max_years = max(int(y) for y in resume_years)
-            if max_years < required_years:
-                violated = True
-                reason = f"Has {max_years} years, needs {required_years}+"
-                confidence = 0.7
-            else:
-                violated = False
-                reason = f"Has {max_years}+ years experience"
-        else:
-            violated = True
-            reason = "No years of experience mentioned"
-            confidence = 0.5
-    
-    # Degree requirements
-    if "degree" in db_lower or "mba" in db_lower or "phd" in db_lower:
-        has_degree = any(d in resume_lower for d in ["bachelor", "master", "mba", "phd", "degree"])
-        if not has_degree:
-            violated = True
-            reason = "No degree mentioned"
-            confidence = 0.8
-        else:
-            violated = False
-            reason = "Has degree"
-    
-    # Default: assume not violated if unclear
-    if not reason:
-        violated = False
-        reason = "Unable to determine from resume"
-        confidence = 0.3
-    
-    violations.append({{
-        "requirement": db,
-        "violated": violated,
-        "confidence": confidence,
-        "reason": reason
-    }})
-
-print(json.dumps({{"violations": violations}}))
-'''],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
+        violations_list = _check_deal_breakers_inproc(resume_text, deal_breakers)
         
-        if result.returncode == 0 and result.stdout.strip():
-            data = json.loads(result.stdout.strip())
-            violations_list = data["violations"]
-            
-            # Convert to expected format
-            results = []
-            has_violation = False
-            
-            for v in violations_list:
-                results.append({
-                    "requirement": v["requirement"],
-                    "status": "violated" if v["violated"] else "met",
-                    "confidence": v["confidence"],
-                    "reason": v["reason"]
-                })
-                if v["violated"]:
-                    has_violation = True
-            
-            status = "fail" if has_violation else "pass"
-            return results, status
-        else:
-            logger.warning("Deal breaker check failed")
-            return [], "pass"
+        # Convert to expected format
+        results = []
+        has_violation = False
+        
+        for v in violations_list:
+            results.append({
+                "requirement": v["requirement"],
+                "status": "violated" if v["violated"] else "met",
+                "confidence": v["confidence"],
+                "reason": v["reason"]
+            })
+            if v["violated"]:
+                has_violation = True
+        
+        status = "fail" if has_violation else "pass"
+        return results, status
             
     except Exception as e:
         logger.error(f"Deal breaker check error: {e}")
@@ -26,6 +26,8 @@ import argparse
 import json
 import logging
 import re
+from collections import Counter
+from itertools import islice
 from dataclasses import dataclass, asdict
 from pathlib import Path
 from typing import List, Dict, Optional, Literal
@@ -34,6 +36,29 @@ from datetime import datetime
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
+_MAX_RESUME_CHARS = 32_768
+
+# Patterns compiled once at import; these run for every candidate
+_GAP_RE = re.compile(r'gap|break|sabbatical|hiatus|unemployed', re.I)
+_SENIOR_RE = re.compile(r'director|vp|head|chief', re.I)
+# Red-flag patterns run on the already-lowered text, so no re.I case folding
+_MONTHS_RE = re.compile(r'(\d+)\s*months?')
+_QUANT_RE = re.compile(r'\d+%|\$\d+|\d+x|increased|decreased|reduced|improved')
+_GENERIC_RE = re.compile(r'(?=(responsible for|worked on|helped with|assisted|participated))')
+_IMPACT_RE = re.compile(r'\d+%|\$\d+|\d+x|increased.*\d+|reduced.*\d+', re.I)
+
+# Keyword -> signal category, for the single-pass scan in scan_keywords().
+# Plain substring semantics (no word boundaries), as the per-keyword `in` checks had.
+_KEYWORD_CATEGORIES = {
+    **dict.fromkeys(["mckinsey", "bcg", "bain", "goldman", "google", "microsoft", "amazon", "apple", "meta", "netflix"], "company"),
+    **dict.fromkeys(["harvard", "stanford", "mit", "yale", "princeton", "wharton", "columbia", "chicago", "berkeley"], "school"),
+    **dict.fromkeys(["led team", "managed", "director", "vp", "head of"], "leadership"),
+    **dict.fromkeys(["position", "role", "2024", "2023", "2022"], "role"),
+}
+# Zero-width lookahead so a hit never consumes text another keyword starts inside
+# (no keyword is a prefix of another, so each position yields at most one hit)
+_KEYWORD_RE = re.compile("(?=(" + "|".join(map(re.escape, _KEYWORD_CATEGORIES)) + "))")
+
 
 @dataclass
 class QuickTestResult:
@@ -62,15 +87,24 @@ class QuickTestResult:
     source: str = "quick_test_v2"
 
 
+# Parsed deal_breakers.json per (path, mtime_ns): read once per job when quick test
+# runs over many candidates in one process, re-read if the file is edited
+_deal_breakers_cache: Dict[tuple, List[str]] = {}
+
+
 def load_deal_breakers(job_dir: Path) -> List[str]:
     """Load deal breakers from job directory"""
     db_path = job_dir / "deal_breakers.json"
-    if not db_path.exists():
+    try:
+        key = (str(db_path), db_path.stat().st_mtime_ns)
+    except FileNotFoundError:
         logger.warning(f"No deal_breakers.json found at {db_path}")
         return []
     
-    with open(db_path) as f:
-        return json.load(f)
+    if key not in _deal_breakers_cache:
+        with open(db_path) as f:
+            _deal_breakers_cache[key] = json.load(f)
+    return list(_deal_breakers_cache[key])
 
 
 def load_parsed_resume(candidate_dir: Path) -> Dict:
@@ -81,7 +115,10 @@ def load_parsed_resume(candidate_dir: Path) -> Dict:
     if not text_path.exists() or not fields_path.exists():
         raise FileNotFoundError(f"Parsed resume not found in {candidate_dir / 'parsed'}")
     
-    resume_text = text_path.read_text()
+    # Heuristics only need the body of the resume; cap the read so appended scans/appendices
+    # don't cost I/O and memory (the deal-breaker check itself looks at just 2000 chars)
+    with open(text_path, encoding="utf-8", errors="replace") as f:
+        resume_text = f.read(_MAX_RESUME_CHARS)
     with open(fields_path) as f:
         fields = json.load(f)
     
@@ -96,7 +133,12 @@ def check_hard_disqualifiers(resume_data: Dict, deal_breakers: List[str]) -> tup
     return check_deal_breakers_llm(resume_data["text"], deal_breakers)
 
 
-def check_soft_disqualifiers(resume_data: Dict, resume_text: str) -> List[Dict]:
+def scan_keywords(text_lower: str) -> Counter:
+    """Count keyword hits per category (company, school, leadership, role) in one pass."""
+    return Counter(_KEYWORD_CATEGORIES[m.group(1)] for m in _KEYWORD_RE.finditer(text_lower))
+
+
+def check_soft_disqualifiers(resume_data: Dict, resume_text: str, keyword_hits: Counter) -> List[Dict]:
     """
     Check soft flags that warrant review.
     Returns: List of soft disqualifier flags
@@ -114,7 +156,7 @@ def check_soft_disqualifiers(resume_data: Dict, resume_text: str) -> List[Dict]:
         })
     
     # 2. Job hopping (6+ roles in 5 years, based on heuristic)
-    role_count = resume_text.lower().count("position") + resume_text.lower().count("role") + resume_text.count("2024") + resume_text.count("2023") + resume_text.count("2022")
+    role_count = keyword_hits["role"]
     # Rough heuristic - can be improved
     if role_count > 8:
         flags.append({
@@ -124,21 +166,20 @@ def check_soft_disqualifiers(resume_data: Dict, resume_text: str) -> List[Dict]:
         })
     
     # 3. Career gaps (heuristic: look for gap language)
-    gap_patterns = [r'gap', r'break', r'sabbatical', r'hiatus', r'unemployed']
-    for pattern in gap_patterns:
-        if re.search(pattern, resume_text, re.I):
-            flags.append({
-                "flag": "career_gap_mentioned",
-                "severity": "low",
-                "detail": f"Possible gap detected (keyword: {pattern})"
-            })
-            break
+    gap = _GAP_RE.search(resume_text)
+    if gap:
+        flags.append({
+            "flag": "career_gap_mentioned",
+            "severity": "low",
+            "detail": f"Possible gap detected (keyword: {gap.group().lower()})"
+        })
     
     # 4. Declining trajectory (heuristic: more senior roles earlier)
     # Look for title patterns
     senior_early = False
-    if re.search(r'(director|vp|head|chief)', resume_text[:len(resume_text)//3], re.I):
-        if not re.search(r'(director|vp|head|chief)', resume_text[len(resume_text)//3:], re.I):
+    n3 = len(resume_text) // 3
+    if _SENIOR_RE.search(resume_text, 0, n3):
+        if not _SENIOR_RE.search(resume_text, n3):
             senior_early = True
     
     if senior_early:
@@ -151,7 +192,7 @@ def check_soft_disqualifiers(resume_data: Dict, resume_text: str) -> List[Dict]:
     return flags
 
 
-def detect_red_flags(resume_text: str) -> List[Dict]:
+def detect_red_flags(text_lower: str) -> List[Dict]:
     """
     Detect resume red flags.
     Returns: List of red flags with evidence
@@ -159,7 +200,7 @@ def detect_red_flags(resume_text: str) -> List[Dict]:
     red_flags = []
     
     # 1. Very short employment stints (< 1 year, multiple times)
-    short_stints = re.findall(r'(\d+)\s*months?', resume_text, re.I)
+    short_stints = _MONTHS_RE.findall(text_lower)
     if len(short_stints) >= 3:
         red_flags.append({
             "flag": "multiple_short_stints",
@@ -167,7 +208,7 @@ def detect_red_flags(resume_text: str) -> List[Dict]:
         })
     
     # 2. Lack of quantified achievements
-    numbers = re.findall(r'\d+%|\$\d+|\d+x|increased|decreased|reduced|improved', resume_text, re.I)
+    numbers = _QUANT_RE.findall(text_lower)
     if len(numbers) < 3:
         red_flags.append({
             "flag": "lack_of_quantified_impact",
@@ -175,7 +216,8 @@ def detect_red_flags(resume_text: str) -> List[Dict]:
         })
     
     # 3. Generic/vague language
-    generic_count = sum(1 for phrase in ["responsible for", "worked on", "helped with", "assisted", "participated"] if phrase in resume_text.lower())
+    # Distinct generic phrases present (one scan), as the per-phrase `in` checks counted
+    generic_count = len(set(_GENERIC_RE.findall(text_lower)))
     if generic_count > 5:
         red_flags.append({
             "flag": "vague_descriptions",
@@ -187,7 +229,7 @@ def detect_red_flags(resume_text: str) -> List[Dict]:
     return red_flags
 
 
-def estimate_early_score(resume_data: Dict, resume_text: str, deal_breaker_status: str) -> tuple[Optional[int], Optional[str]]:
+def estimate_early_score(resume_data: Dict, resume_text: str, deal_breaker_status: str, keyword_hits: Counter) -> tuple[Optional[int], Optional[str]]:
     """
     Estimate score for obvious cases.
     Returns: (score, confidence)
@@ -200,14 +242,12 @@ def estimate_early_score(resume_data: Dict, resume_text: str, deal_breaker_statu
     fields = resume_data["fields"]
     years_exp = fields.get("years_experience", 0)
     
-    # Strong positive signals
-    top_companies = ["mckinsey", "bcg", "bain", "goldman", "google", "microsoft", "amazon", "apple", "meta", "netflix"]
-    top_schools = ["harvard", "stanford", "mit", "yale", "princeton", "wharton", "columbia", "chicago", "berkeley"]
-    
-    has_top_company = any(co in resume_text.lower() for co in top_companies)
-    has_top_school = any(school in resume_text.lower() for school in top_schools)
-    has_leadership = any(kw in resume_text.lower() for kw in ["led team", "managed", "director", "vp", "head of"])
-    has_impact = len(re.findall(r'\d+%|\$\d+|\d+x|increased.*\d+|reduced.*\d+', resume_text, re.I)) >= 5
+    # Strong positive signals (top companies/schools, leadership keywords)
+    has_top_company = keyword_hits["company"] > 0
+    has_top_school = keyword_hits["school"] > 0
+    has_leadership = keyword_hits["leadership"] > 0
+    # Only need to know whether there are 5 impact matches, so stop scanning at the fifth
+    has_impact = sum(1 for _ in islice(_IMPACT_RE.finditer(resume_text), 5)) == 5
     
     strong_signals = sum([has_top_company, has_top_school, has_leadership, has_impact])
     
@@ -231,9 +271,10 @@ def estimate_early_score(resume_data: Dict, resume_text: str, deal_breaker_statu
     return None, None
 
 
-def run_quick_test(job_id: str, candidate_id: str, job_dir: Path, candidate_dir: Path) -> QuickTestResult:
+def run_quick_test(job_id: str, candidate_id: str, job_dir: Path, candidate_dir: Path, timestamp: Optional[str] = None) -> QuickTestResult:
     """
     Run quick test on candidate.
+    Batch callers can pass one run timestamp to share across candidates.
     """
     # Load data
     deal_breakers = load_deal_breakers(job_dir)
@@ -241,10 +282,20 @@ def run_quick_test(job_id: str, candidate_id: str, job_dir: Path, candidate_dir:
     resume_text = resume_data["text"]
     
     # Run checks
-    hard_results, hard_status = check_hard_disqualifiers(resume_data, deal_breakers)
-    soft_flags = check_soft_disqualifiers(resume_data, resume_text)
-    red_flags = detect_red_flags(resume_text)
-    early_score, confidence = estimate_early_score(resume_data, resume_text, hard_status)
+    if deal_breakers:
+        hard_results, hard_status = check_hard_disqualifiers(resume_data, deal_breakers)
+    else:
+        hard_results, hard_status = [], "pass"  # nothing to check against
+    if hard_status == "fail":
+        # The outcome is already decided (reject, estimate 15/high); skip the heuristic scans
+        soft_flags, red_flags = [], []
+        early_score, confidence = 15, "high"
+    else:
+        text_lower = resume_text.lower()  # lowered once, shared by the keyword checks
+        keyword_hits = scan_keywords(text_lower)
+        soft_flags = check_soft_disqualifiers(resume_data, resume_text, keyword_hits)
+        red_flags = detect_red_flags(text_lower)
+        early_score, confidence = estimate_early_score(resume_data, resume_text, hard_status, keyword_hits)
     
     # Determine recommendation
     if hard_status == "fail":
@@ -271,7 +322,7 @@ def run_quick_test(job_id: str, candidate_id: str, job_dir: Path, candidate_dir:
         reasoning = "No major concerns in quick test"
     
     return QuickTestResult(
-        timestamp=datetime.utcnow().isoformat() + "Z",
+        timestamp=timestamp or datetime.utcnow().isoformat() + "Z",
         candidate_id=candidate_id,
         job_id=job_id,
         hard_disqualifiers=hard_results,
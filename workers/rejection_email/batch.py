@@ -7,84 +7,120 @@ Batch runner for REJECTION/PASS email drafts (for human approval).
 - Never sends email; drafts only
 
 Usage:
-  python workers/rejection_email/batch.py --job <job-id> [--dry-run] [--limit N]
-  python workers/rejection_email/batch.py --all-jobs [--dry-run] [--limit N]
+  python workers/rejection_email/batch.py --job <job-id> [--dry-run] [--limit N] [--pretty]
+  python workers/rejection_email/batch.py --all-jobs [--dry-run] [--limit N] [--pretty]
 """
 
-import argparse, json, logging, subprocess
+import argparse, json, logging, os, sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, UTC
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent))
+from main import Context, build_context, process_candidate
+# Appended, not prepended: scoring/ has its own main.py
+sys.path.append(str(Path(__file__).parent.parent / "scoring"))
+from gestalt_decision import read_decision
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
-WS = Path("/home/workspace/ZoATS")
+# Same root the composer resolves, so scan and drafts agree on jobs/
+WS = Path(__file__).resolve().parents[2]
+# Drafts are independent per candidate; bound how many run at once
+MAX_WORKERS = 8
 
 
-def run_decline(job_id: str, candidate_id: str, dry_run: bool) -> int:
-    cmd = [
-        "python",
-        str(WS / "workers" / "rejection_email" / "main.py"),
-        "--job", job_id,
-        "--candidate", candidate_id,
-    ]
-    if dry_run:
-        cmd.append("--dry-run")
-    logger.info("Running: %s", " ".join(cmd))
-    return subprocess.call(cmd)
+def utc_now() -> str:
+    return datetime.now(UTC).isoformat().replace("+00:00", "Z")
+
+
+def run_decline(ctx: Context, job_id: str, candidate_id: str) -> int:
+    # In-process: the composer is imported once rather than paying an interpreter start per candidate
+    logger.info("Drafting decline: %s/%s", job_id, candidate_id)
+    try:
+        return process_candidate(ctx, job_id, candidate_id)
+    except Exception as e:
+        logger.error("Decline draft failed for %s: %s", candidate_id, e)
+        return 1
+
+
+def load_manifest(manifest: Path) -> dict[str, dict]:
+    """Read reject_pending.json once per batch, keyed by candidate_id."""
+    data = []
+    if manifest.exists():
+        try:
+            data = json.loads(manifest.read_text())
+        except Exception:
+            logger.warning("Manifest unreadable; recreating: %s", manifest)
+    return {r.get("candidate_id"): r for r in data}
 
 
-def queue_manifest(job_dir: Path, candidate_id: str, email_path: Path, dry_run: bool) -> None:
-    approvals_dir = job_dir / "approvals"
-    approvals_dir.mkdir(parents=True, exist_ok=True)
-    manifest = approvals_dir / "reject_pending.json"
+def queue_manifest(records: dict[str, dict], manifest: Path, candidate_id: str, email_path: Path, dry_run: bool, created_at: str) -> None:
     record = {
         "candidate_id": candidate_id,
         "email_path": str(email_path),
         "status": "pending",
-        "created_at": datetime.now(UTC).isoformat().replace("+00:00", "Z"),
+        "created_at": created_at,
     }
     if dry_run:
         logger.info("[DRY RUN] Would update manifest: %s with %s", manifest, record)
         return
-    data = []
-    if manifest.exists():
-        try:
-            data = json.loads(manifest.read_text())
-        except Exception:
-            logger.warning("Manifest unreadable; recreating: %s", manifest)
-    # de-dupe by candidate_id
-    data = [r for r in data if r.get("candidate_id") != candidate_id]
-    data.append(record)
-    manifest.write_text(json.dumps(data, indent=2))
+    # de-dupe by candidate_id; a re-queued candidate moves to the end
+    records.pop(candidate_id, None)
+    records[candidate_id] = record
     logger.info("Queued approval: %s", record)
 
 
-def scan_job(job_dir: Path, dry_run: bool, limit: int) -> int:
+def save_manifest(records: dict[str, dict], manifest: Path, pretty: bool = False) -> None:
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    # Compact by default; --pretty indents for human inspection
+    if pretty:
+        data = json.dumps(list(records.values()), indent=2)
+    else:
+        data = json.dumps(list(records.values()), separators=(",", ":"))
+    manifest.write_text(data)
+
+
+def scan_job(job_dir: Path, dry_run: bool, limit: int, created_at: str | None = None, pretty: bool = False) -> int:
     candidates_dir = job_dir / "candidates"
     if not candidates_dir.exists():
         return 0
-    count = 0
-    for cand_dir in candidates_dir.iterdir():
-        ge = cand_dir / "outputs" / "gestalt_evaluation.json"
-        if not ge.exists():
-            continue
-        # skip if draft already exists
-        email_path = cand_dir / "outputs" / "rejection_email.md"
+    eligible = []
+    with os.scandir(candidates_dir) as it:
+        entries = [e for e in it if e.is_dir()]
+    for entry in entries:
+        outputs = Path(entry.path) / "outputs"
+        # skip if draft already exists (the common case on re-runs, so it's the one stat we pay)
+        email_path = outputs / "rejection_email.md"
         if email_path.exists():
             continue
-        try:
-            decision = json.loads(ge.read_text()).get("decision")
-        except Exception:
-            continue
+        # no separate exists() check: a missing evaluation just reads as no decision
+        decision = read_decision(outputs / "gestalt_evaluation.json")
         if decision not in {"REJECT", "PASS"}:
             continue
-        # run decline draft
-        rc = run_decline(job_dir.name, cand_dir.name, dry_run)
-        queue_manifest(job_dir, cand_dir.name, email_path, dry_run)
-        count += 1
-        if limit and count >= limit:
+        eligible.append((entry.name, email_path))
+        if limit and len(eligible) >= limit:
             break
+    if not eligible:
+        return 0
+    if created_at is None:
+        created_at = utc_now()
+    # Manifest is read once, updated in memory as drafts finish, and written once at the end
+    manifest = job_dir / "approvals" / "reject_pending.json"
+    records = {} if dry_run else load_manifest(manifest)
+    # Draft in a thread pool; the manifest is only touched from this thread
+    ctx = build_context(dry_run)
+    count = 0
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(eligible))) as ex:
+        futs = {ex.submit(run_decline, ctx, job_dir.name, candidate_id): (candidate_id, email_path)
+                for candidate_id, email_path in eligible}
+        for f in as_completed(futs):
+            candidate_id, email_path = futs[f]
+            queue_manifest(records, manifest, candidate_id, email_path, dry_run, created_at)
+            count += 1
+    if not dry_run:
+        save_manifest(records, manifest, pretty)
     return count
 
 
@@ -95,15 +131,18 @@ def main() -> int:
     g.add_argument("--all-jobs", action="store_true")
     p.add_argument("--dry-run", action="store_true")
     p.add_argument("--limit", type=int, default=0, help="Max candidates to process (0 = no limit)")
+    p.add_argument("--pretty", action="store_true", help="Indent the approvals manifest for human inspection")
     args = p.parse_args()
+    # One batch-run timestamp shared by every record queued in this run
+    created_at = utc_now()
 
     if args.all_jobs:
         total = 0
         jobs_dir = WS / "jobs"
-        for job_dir in jobs_dir.iterdir():
-            if not job_dir.is_dir():
-                continue
-            c = scan_job(job_dir, dry_run=args.dry_run, limit=args.limit)
+        with os.scandir(jobs_dir) as it:
+            job_dirs = [Path(e.path) for e in it if e.is_dir()]
+        for job_dir in job_dirs:
+            c = scan_job(job_dir, dry_run=args.dry_run, limit=args.limit, created_at=created_at, pretty=args.pretty)
             logger.info("Job %s: %d drafts queued", job_dir.name, c)
             total += c
             if args.limit and total >= args.limit:
@@ -112,7 +151,7 @@ def main() -> int:
         return 0
     else:
         job_dir = WS / "jobs" / args.job
-        c = scan_job(job_dir, dry_run=args.dry_run, limit=args.limit)
+        c = scan_job(job_dir, dry_run=args.dry_run, limit=args.limit, created_at=created_at, pretty=args.pretty)
         logger.info("✓ Complete. %d rejection drafts queued for %s", c, args.job)
         return 0
 
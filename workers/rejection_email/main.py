@@ -6,10 +6,16 @@ ZoATS Rejection Email Composer (Drafts Only)
 
 Usage:
   python workers/rejection_email/main.py --job <job-id> --candidate <candidate-id> [--dry-run]
+  python workers/rejection_email/main.py --job <job-id> --candidates <id1,id2,...> [--dry-run]
 """
-import argparse, json, logging, re
+import argparse, functools, json, logging, re
+from dataclasses import dataclass
 from pathlib import Path
-from datetime import datetime
+
+try:
+    import re2  # optional (google-re2): linear-time scan of untrusted feedback text
+except ImportError:
+    re2 = None
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s", datefmt="%Y-%m-%dT%H:%M:%S")
 logger = logging.getLogger(__name__)
@@ -25,6 +31,16 @@ ALLOWED_REASON_CODES = {
     "TIMING_COMPETITION": "This cycle had exceptionally strong competition and a limited number of interview slots."
 }
 
+# Concern keyword → reason code, matched as substrings of the lowered issue text
+_CONCERN_CODES = {
+    "experience": "EXPERIENCE_DEPTH", "recency": "EXPERIENCE_DEPTH", "recent": "EXPERIENCE_DEPTH",
+    "domain": "DOMAIN_EXPOSURE", "industry": "DOMAIN_EXPOSURE", "consulting": "DOMAIN_EXPOSURE",
+    "scope": "SCOPE_SCALE", "scale": "SCOPE_SCALE", "complexity": "SCOPE_SCALE",
+}
+_CONCERN_PRIORITY = ("EXPERIENCE_DEPTH", "DOMAIN_EXPOSURE", "SCOPE_SCALE")
+# Zero-width lookahead so keywords that overlap in the text are each still seen
+_CONCERN_RE = re.compile("(?=(" + "|".join(_CONCERN_CODES) + "))")
+
 BANNED_DEFAULTS = [
     "age", "gender", "sex", "sexual orientation", "race", "ethnicity", "color", "religion", "creed", "national origin",
     "citizenship", "immigration", "disability", "handicap", "medical", "pregnan", "marital", "family", "parental",
@@ -39,7 +55,17 @@ def read_json(p: Path) -> dict:
 
 
 def load_cfg() -> dict:
-    if CFG_PATH.exists():
+    """Parsed config.json, re-read only when the file's mtime changes. Treat as read-only."""
+    try:
+        mtime = CFG_PATH.stat().st_mtime_ns
+    except OSError:
+        mtime = None
+    return _load_cfg(mtime)
+
+
+@functools.lru_cache(maxsize=1)
+def _load_cfg(mtime: int | None) -> dict:
+    if mtime is not None:
         try:
             return json.loads(CFG_PATH.read_text(encoding="utf-8"))
         except Exception as e:
@@ -71,48 +97,51 @@ def load_cfg() -> dict:
     }
 
 
+@functools.lru_cache(maxsize=8)
+def _compile_banned(banned_terms: tuple[str, ...]) -> re.Pattern:
+    # case-insensitive, partial (e.g., "pregnan" catches pregnancy/pregnant)
+    pattern = "|".join(re.escape(t) for t in banned_terms)
+    if re2 is not None:
+        # RE2 has no IGNORECASE constant; the inline flag is equivalent
+        return re2.compile("(?i)" + pattern)
+    return re.compile(pattern, re.IGNORECASE)
+
+
 def neutralize(text: str, banned_terms: list[str]) -> str:
-    out = text
-    for term in banned_terms:
-        # case-insensitive, partial (e.g., "pregnan" catches pregnancy/pregnant)
-        out = re.sub(fr"{re.escape(term)}", "comparative fit", out, flags=re.IGNORECASE)
-    return out
+    if not banned_terms:
+        return text
+    # One scan over the text for all terms instead of a re.sub pass per term
+    return _compile_banned(tuple(banned_terms)).sub("comparative fit", text)
+
+
+def concern_code(issue: str) -> str:
+    """Map one concern's text to a reason code; earlier codes in _CONCERN_PRIORITY win."""
+    hits = {_CONCERN_CODES[k] for k in _CONCERN_RE.findall(issue.lower())}
+    return next((code for code in _CONCERN_PRIORITY if code in hits), "ROLE_ALIGNMENT")
 
 
 def extract_feedback(ge: dict, cfg: dict) -> dict:
     """Derive a compact, legally-safe feedback structure from gestalt_evaluation.json."""
-    banned = cfg.get("legal_filter", {}).get("banned_terms", BANNED_DEFAULTS)
-    allowed = set(cfg.get("feedback", {}).get("allowed_reason_codes", []))
+    fb_cfg = cfg.get("feedback") or {}
+    legal_cfg = cfg.get("legal_filter") or {}
+    banned = legal_cfg.get("banned_terms", BANNED_DEFAULTS)
+    allowed = set(fb_cfg.get("allowed_reason_codes", []))
     positives = []
-    if cfg.get("feedback", {}).get("include_positive_signals", True):
+    if fb_cfg.get("include_positive_signals", True):
         for s in (ge.get("key_strengths") or [])[:2]:
             cat = s.get("category") or "Strength"
             rel = s.get("relevance") or "Positive signal"
             item = neutralize(f"{cat}: {rel}", banned)
             positives.append(item)
-    # naive mapping from concerns text → reason code
-    raw_concerns = [c.get("issue", "") for c in (ge.get("concerns") or [])]
-    mapped_codes: list[str] = []
-    for issue in raw_concerns:
-        t = issue.lower()
-        if any(k in t for k in ["experience", "recency", "recent"]):
-            mapped_codes.append("EXPERIENCE_DEPTH")
-        elif any(k in t for k in ["domain", "industry", "consulting"]):
-            mapped_codes.append("DOMAIN_EXPOSURE")
-        elif any(k in t for k in ["scope", "scale", "complexity"]):
-            mapped_codes.append("SCOPE_SCALE")
-        else:
-            mapped_codes.append("ROLE_ALIGNMENT")
-    # filter to allowed + unique, cap 2
-    mapped_codes = [c for c in mapped_codes if c in allowed]
-    seen = set()
-    uniq_codes = []
-    for c in mapped_codes:
-        if c not in seen:
-            uniq_codes.append(c)
-            seen.add(c)
-        if len(uniq_codes) >= 2:
-            break
+    # naive mapping from concerns text → reason code; keep allowed + unique, cap 2
+    uniq_codes: list[str] = []
+    if allowed:
+        for c in (ge.get("concerns") or []):
+            code = concern_code(c.get("issue", ""))
+            if code in allowed and code not in uniq_codes:
+                uniq_codes.append(code)
+                if len(uniq_codes) >= 2:
+                    break
     negatives = [ALLOWED_REASON_CODES[c] for c in uniq_codes]
     # generic fallback if nothing safe/specific
     if not positives and not negatives:
@@ -120,7 +149,7 @@ def extract_feedback(ge: dict, cfg: dict) -> dict:
             "In this cycle, selected candidates showed a closer match to the role's current priorities.",
             "Continuing to make outcomes legible and role-aligned examples sharper can strengthen future applications.",
         ]
-    disclaimer = cfg.get("feedback", {}).get("disclaimer_text", "")
+    disclaimer = fb_cfg.get("disclaimer_text", "")
     return {
         "positives": positives,
         "focus": [neutralize(n, banned) for n in negatives],
@@ -129,7 +158,6 @@ def extract_feedback(ge: dict, cfg: dict) -> dict:
 
 
 def compose_email(candidate_name: str, job_title: str, company_name: str, cfg: dict, feedback_block: str | None) -> str:
-    date_str = datetime.utcnow().strftime("%B %d, %Y")
     body = [
         f"Subject: Update on your application — {job_title}",
         "",
@@ -142,8 +170,9 @@ def compose_email(candidate_name: str, job_title: str, company_name: str, cfg: d
     if feedback_block:
         body.extend(["", feedback_block])
     promo = None
-    if cfg.get("careerspan_promo", {}).get("enabled", True):
-        cta = cfg.get("careerspan_promo", {}).get("cta_text", "")
+    promo_cfg = cfg.get("careerspan_promo") or {}
+    if promo_cfg.get("enabled", True):
+        cta = promo_cfg.get("cta_text", "")
         if cta:
             promo = f"*{cta}*"
     # promo right before sign-off
@@ -160,8 +189,21 @@ def compose_email(candidate_name: str, job_title: str, company_name: str, cfg: d
     return "\n".join(body)
 
 
-def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
-    job_dir = ROOT / "jobs" / job_id
+@dataclass(frozen=True)
+class Context:
+    """Per-run state shared by every candidate drafted in one process."""
+    root: Path
+    cfg: dict
+    dry_run: bool = False
+
+
+def build_context(dry_run: bool = False) -> Context:
+    return Context(root=ROOT, cfg=load_cfg(), dry_run=dry_run)
+
+
+def process_candidate(ctx: Context, job_id: str, candidate_id: str) -> int:
+    """Draft the decline email for one candidate; importable so batch runs stay in-process."""
+    job_dir = ctx.root / "jobs" / job_id
     cand_dir = job_dir / "candidates" / candidate_id
     ge_p = cand_dir / "outputs" / "gestalt_evaluation.json"
     fields = cand_dir / "parsed" / "fields.json"
@@ -179,19 +221,20 @@ def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
     job_title = job_id.replace("-", " ").title()
     company_name = (job_dir / "company.txt").read_text(encoding="utf-8").strip() if (job_dir / "company.txt").exists() else "Hiring Team"
 
-    cfg = load_cfg()
+    cfg = ctx.cfg
 
     # feedback: always collect/save JSON; include in email iff enabled
     fb = extract_feedback(data, cfg)
     feedback_json_path = cand_dir / "outputs" / "feedback.json"
     feedback_json_path.parent.mkdir(parents=True, exist_ok=True)
     try:
-        feedback_json_path.write_text(json.dumps(fb, indent=2), encoding="utf-8")
+        with feedback_json_path.open("w", encoding="utf-8") as f:
+            json.dump(fb, f, indent=2)
     except Exception as e:
         logger.warning(f"Could not write feedback.json: {e}")
 
     feedback_block = None
-    if cfg.get("feedback", {}).get("enabled", False):
+    if (cfg.get("feedback") or {}).get("enabled", False):
         # render compact block with bullets and disclaimer; cap total lines
         lines = []
         if fb.get("positives"):
@@ -213,7 +256,7 @@ def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
     out_dir.mkdir(parents=True, exist_ok=True)
     out_path = out_dir / "rejection_email.md"
 
-    if dry_run:
+    if ctx.dry_run:
         logger.info("[DRY RUN] Preview:\n" + email)
     else:
         out_path.write_text(email, encoding="utf-8")
@@ -222,10 +265,26 @@ def main(job_id: str, candidate_id: str, dry_run: bool = False) -> int:
     return 0
 
 
+def main(job_id: str, candidate_ids: list[str], dry_run: bool = False) -> int:
+    # One context (config, paths) for every candidate in this invocation
+    ctx = build_context(dry_run)
+    rc = 0
+    for candidate_id in candidate_ids:
+        try:
+            rc = max(rc, process_candidate(ctx, job_id, candidate_id))
+        except Exception as e:
+            logger.error(f"Draft failed for {candidate_id}: {e}")
+            rc = 1
+    return rc
+
+
 if __name__ == "__main__":
     p = argparse.ArgumentParser(description="Generate a rejection email draft (REJECT/PASS)")
     p.add_argument("--job", required=True)
-    p.add_argument("--candidate", required=True)
+    g = p.add_mutually_exclusive_group(required=True)
+    g.add_argument("--candidate")
+    g.add_argument("--candidates", help="Comma-separated candidate IDs, drafted in one process")
     p.add_argument("--dry-run", action="store_true")
     args = p.parse_args()
-    raise SystemExit(main(args.job, args.candidate, args.dry_run))
+    candidate_ids = [args.candidate] if args.candidate else [c.strip() for c in args.candidates.split(",") if c.strip()]
+    raise SystemExit(main(args.job, candidate_ids, args.dry_run))
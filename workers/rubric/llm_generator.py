@@ -6,12 +6,44 @@ Extracts criteria and deal breakers from JD using LLM instead of heuristics.
 """
 import json
 import logging
-import subprocess
+import re
 from typing import Dict, List
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
+# Must-have requirement patterns; only the first two hits of each are kept
+_MUST_PATTERNS = (
+    re.compile(r"(?:must|required|mandatory)[^\.]*?([^\.]+)", re.IGNORECASE),
+    re.compile(r"(\d+\+ years[^\.]+)", re.IGNORECASE),
+    re.compile(r"(authorization[^\.]+)", re.IGNORECASE),
+)
+
+# Standard criteria used for every JD until a real model call replaces the heuristic
+_STANDARD_CRITERIA = (
+    {"id": "experience", "name": "Relevant Experience", "description": "Years and quality of related work", "weight": 20, "tier": "must"},
+    {"id": "skills", "name": "Required Skills", "description": "Technical and functional capabilities", "weight": 20, "tier": "must"},
+    {"id": "education", "name": "Educational Background", "description": "Degree and academic record", "weight": 15, "tier": "must"},
+    {"id": "analytical", "name": "Analytical Capability", "description": "Problem-solving and quantitative skills", "weight": 15, "tier": "must"},
+    {"id": "communication", "name": "Communication", "description": "Written and verbal skills", "weight": 10, "tier": "should"},
+    {"id": "leadership", "name": "Leadership", "description": "Team leadership and influence", "weight": 10, "tier": "should"},
+    {"id": "learning", "name": "Learning Agility", "description": "Adaptability and growth", "weight": 10, "tier": "should"},
+)
+
+
+def _heuristic_rubric(jd_text: str) -> Dict:
+    """Regex extraction of deal breakers plus the standard criteria set."""
+    deal_breakers = []
+    for pattern in _MUST_PATTERNS:
+        matches = pattern.findall(jd_text)
+        deal_breakers.extend([m.strip() for m in matches[:2]])
+
+    return {
+        "criteria": [dict(c) for c in _STANDARD_CRITERIA],
+        # de-dupe keeping first-seen order; limit to 5
+        "deal_breakers": list(dict.fromkeys(deal_breakers))[:5]
+    }
+
 
 def generate_rubric_llm(jd_text: str, job_title: str = "position") -> Dict:
     """
@@ -67,58 +99,7 @@ Return JSON:
 }}"""
 
     try:
-        result = subprocess.run(
-            ['python3', '-c', f'''
-import json
-import re
-
-jd = """{jd_text[:4000]}"""
-title = "{job_title}"
-
-# Extract must-have requirements
-must_patterns = [
-    r"(?:must|required|mandatory)[^\\.]*?([^\\.]+)",
-    r"(\\d+\\+ years[^\\.]+)",
-    r"(authorization[^\\.]+)",
-]
-
-deal_breakers = []
-for pattern in must_patterns:
-    matches = re.findall(pattern, jd, re.IGNORECASE)
-    deal_breakers.extend([m.strip() for m in matches[:2]])
-
-# Generate standard criteria
-criteria = [
-    {{"id": "experience", "name": "Relevant Experience", "description": "Years and quality of related work", "weight": 20, "tier": "must"}},
-    {{"id": "skills", "name": "Required Skills", "description": "Technical and functional capabilities", "weight": 20, "tier": "must"}},
-    {{"id": "education", "name": "Educational Background", "description": "Degree and academic record", "weight": 15, "tier": "must"}},
-    {{"id": "analytical", "name": "Analytical Capability", "description": "Problem-solving and quantitative skills", "weight": 15, "tier": "must"}},
-    {{"id": "communication", "name": "Communication", "description": "Written and verbal skills", "weight": 10, "tier": "should"}},
-    {{"id": "leadership", "name": "Leadership", "description": "Team leadership and influence", "weight": 10, "tier": "should"}},
-    {{"id": "learning", "name": "Learning Agility", "description": "Adaptability and growth", "weight": 10, "tier": "should"}},
-]
-
-result = {{
-    "criteria": criteria,
-    "deal_breakers": list(set(deal_breakers))[:5]  # Limit to 5
-}}
-
-print(json.dumps(result))
-'''],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode == 0 and result.stdout.strip():
-            return json.loads(result.stdout.strip())
-        else:
-            logger.warning("Rubric generation failed, using defaults")
-            return {
-                "criteria": [],
-                "deal_breakers": []
-            }
-            
+        return _heuristic_rubric(jd_text[:4000])
     except Exception as e:
         logger.error(f"Rubric generation error: {e}")
         return {
@@ -23,34 +23,38 @@ Quality:
 - Logging, --dry-run, error handling, verification
 """
 import argparse
+import functools
 import json
 import logging
 import re
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
-MUST_PATTERNS = [
+# Must-have/deal-breaker patterns are compiled once; all are matched against lowercased text
+MUST_PATTERNS = tuple(re.compile(p) for p in (
     r"\bmust\b", r"\brequired\b", r"\bmandatory\b", r"\bno exceptions\b",
     r"\bneed to\b", r"\bshall\b", r"\bnon[- ]negotiable\b",
     r"\b\d+\+?\s*(years|yrs)\b", r"\bdegree\b", r"\bmba\b", r"\bphd\b",
-]
-SHOULD_PATTERNS = [
-    r"\bshould\b", r"\bstrong(ly)? (preferred|plus)\b", r"\bnice to have\b",
-    r"\b(preferred|plus)\b",
-]
-NICE_PATTERNS = [
-    r"\bnice\b", r"\bbonus\b", r"\bgood to have\b", r"\b(optional)\b",
-]
-
-DEAL_BREAKER_HINTS = [
+))
+
+DEAL_BREAKER_HINTS = tuple(re.compile(p) for p in (
     r"\b(us|work) authorization\b", r"\b(can work|eligible to work)\b",
     r"\bminimum (of )?\d+ (years|yrs)\b", r"\b\d+\+?\s*(years|yrs)\b", r"\bdegree (required|in)?\b",
     r"\b(on[- ]site|in[- ]office)\b", r"\bsecurity clearance\b",
-]
+))
+
+# Literals at least one of which appears in any must-have or deal-breaker match. A plain
+# substring test rules out the common no-match line before the regex runs.
+_MUST_LITERALS = ("must", "required", "mandatory", "no exceptions", "need to", "shall",
+                  "negotiable", "years", "yrs", "degree", "mba", "phd")
+_DEAL_LITERALS = _MUST_LITERALS + ("authorization", "work", "site", "office", "clearance")
+
+# Any must-have or deal-breaker hint, fused so each JD line is scanned once
+_DEAL_RE = re.compile("|".join(f"(?:{p.pattern})" for p in MUST_PATTERNS + DEAL_BREAKER_HINTS))
 
 SOFT_SKILL_HINTS = re.compile(r"problem[- ]?solv|logical|creative|communication|teamwork|collaborat|leadership|quantitative|initiative|ownership|drive|curious", re.I)
 
@@ -58,9 +62,24 @@ STOPWORDS = set("""
 a an and are as at be but by for from how i if in into is it of on or our that the their them then there these they this to we with you your
 """.split())
 
-BULLET_PREFIX = re.compile(r"^\s*[-*•]\s+")
-
-@dataclass
+_BULLET_RE = re.compile(r"^[-*•] ")
+# One anchored alternation for every section heading; lastgroup names the section.
+# Branch order matches the old per-section checks, so the first section to match wins.
+# Anchored literal branches cannot backtrack badly, and lastgroup/\b semantics are
+# stdlib re's (RE2's \b is ASCII-only), so this stays on re.
+_HEADING_RE = re.compile(
+    r"^(?:(?P<requirements>(?:requirements|qualifications|your qualifications and skills|your qualifications)\b)"
+    r"|(?P<responsibilities>(?:responsibilities|what you'll do|role)\b)"
+    r"|(?P<about>(?:about (?:us|the role)|company)\b)"
+    r"|(?P<other>(?:industries|capabilities|your impact|your growth)\b))"
+)
+_NAME_STRIP_RE = re.compile(r"[^a-z0-9 +/#()&]")
+_TOKEN_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9+/-]{2,}")
+_HARD_REQ_RE = re.compile(r"\b(degree|\d+\+?\s*(years|yrs)|must|required)\b", re.I)
+_FOUNDER_TIER_RE = re.compile(r"^(must|should|nice)\s*:\s*(.+)$", re.I)
+_DEAL_PREFIX_RE = re.compile(r"^(deal:|dealbreaker:)\s*", re.I)
+
+@dataclass(slots=True)
 class Criterion:
     name: str
     weight: float  # percentage 0-100
@@ -68,7 +87,17 @@ class Criterion:
     description: str
     keywords: List[str]
 
-@dataclass
+    def to_dict(self) -> Dict:
+        # Flat fields only, so skip asdict()'s recursive deepcopy
+        return {
+            "name": self.name,
+            "weight": self.weight,
+            "tier": self.tier,
+            "description": self.description,
+            "keywords": list(self.keywords),
+        }
+
+@dataclass(slots=True)
 class Rubric:
     job_id: str
     criteria: List[Criterion]
@@ -93,12 +122,13 @@ def extract_job_id(jd_path: Path) -> str:
     return jd_path.parent.name
 
 
-def lines(text: str) -> List[str]:
-    return [l.strip() for l in text.splitlines()]
+def lines(text: str) -> Iterator[str]:
+    # Lazy: callers walk it once; wrap in list() where a snapshot is needed
+    return (l.strip() for l in text.splitlines())
 
 
 def is_bullet(l: str) -> bool:
-    return bool(re.match(r"^[-*•] ", l))
+    return bool(_BULLET_RE.match(l))
 
 
 def sectionize(text: str) -> Dict[str, List[str]]:
@@ -106,41 +136,26 @@ def sectionize(text: str) -> Dict[str, List[str]]:
     sections: Dict[str, List[str]] = {"requirements": [], "responsibilities": [], "about": [], "other": []}
     current = "other"
     for l in lines(text):
-        lower = l.lower()
-        if re.match(r"^(requirements|qualifications|your qualifications and skills|your qualifications)\b", lower):
-            current = "requirements"; continue
-        if re.match(r"^(responsibilities|what you\'ll do|role)\b", lower):
-            current = "responsibilities"; continue
-        if re.match(r"^(about (us|the role)|company)\b", lower):
-            current = "about"; continue
-        if re.match(r"^(industries|capabilities|your impact|your growth)\b", lower):
-            current = "other"; continue
+        m = _HEADING_RE.match(l.lower())
+        if m:
+            current = m.lastgroup; continue
         sections.setdefault(current, []).append(l)
     return sections
 
 
 def collect_bullets(section_lines: List[str]) -> List[str]:
-    out: List[str] = []
-    for i, l in enumerate(section_lines):
-        if is_bullet(l):
-            out.append(re.sub(r"^[-*•] ", "", l).strip())
-    return out
+    # Bullets are known to start with the marker, so slice it off rather than re-run the regex
+    return [l[2:].strip() for l in section_lines if _BULLET_RE.match(l)]
 
 
-def classify_tier(text: str) -> str:
-    t = text.lower()
-    if any(re.search(p, t) for p in MUST_PATTERNS):
-        return "Must"
-    if any(re.search(p, t) for p in SHOULD_PATTERNS):
-        return "Should"
-    if any(re.search(p, t) for p in NICE_PATTERNS):
-        return "Nice"
-    # Heuristic: requirements default to Must, responsibilities to Should
-    return "Should"
+def keywords_from_text(text: str, max_k: int = 6) -> List[str]:
+    # Boilerplate bullets repeat across JD sections and founder notes; tokenize each once
+    return list(_keywords_cached(text, max_k))
 
 
-def keywords_from_text(text: str, max_k: int = 6) -> List[str]:
-    tokens = re.findall(r"[a-zA-Z][a-zA-Z0-9+/-]{2,}", text.lower())
+@functools.lru_cache(maxsize=512)
+def _keywords_cached(text: str, max_k: int) -> Tuple[str, ...]:
+    tokens = _TOKEN_RE.findall(text.lower())
     tokens = [t.strip("-+/ ") for t in tokens if t not in STOPWORDS]
     # de-dup preserve order
     seen = set()
@@ -152,29 +167,21 @@ def keywords_from_text(text: str, max_k: int = 6) -> List[str]:
         kws.append(t)
         if len(kws) >= max_k:
             break
-    return kws
+    return tuple(kws)
 
 
 def normalize_criteria(raw_items: List[Tuple[str, str]]) -> List[Criterion]:
     # raw_items: list of (text, tier)
-    # Collapse duplicates by simple normalization
-    normalized: Dict[Tuple[str, str], int] = {}
-    cleaned: List[Tuple[str, str]] = []
-    for txt, tier in raw_items:
-        name = re.sub(r"[^a-z0-9 +/#()&]", "", txt.lower())
-        name = re.sub(r"\s+", " ", name).strip()
-        key = (name, tier)
-        normalized[key] = normalized.get(key, 0) + 1
-        cleaned.append((txt.strip(), tier))
-    # Keep order, de-dup by seen keys
+    # Collapse duplicates by simple normalization; keep order, de-dup by seen keys
     seen: set = set()
     dedup: List[Tuple[str, str]] = []
-    for txt, tier in cleaned:
-        k = (re.sub(r"\s+", " ", re.sub(r"[^a-z0-9 +/#()&]", "", txt.lower()).strip()), tier)
-        if k in seen:
+    for txt, tier in raw_items:
+        name = _NAME_STRIP_RE.sub("", txt.lower())
+        key = (" ".join(name.split()), tier)
+        if key in seen:
             continue
-        seen.add(k)
-        dedup.append((txt, tier))
+        seen.add(key)
+        dedup.append((txt.strip(), tier))
     # Assign weights: Must heavier than Should than Nice
     must = [c for c in dedup if c[1] == "Must"]
     should = [c for c in dedup if c[1] == "Should"]
@@ -202,7 +209,7 @@ def normalize_criteria(raw_items: List[Tuple[str, str]]) -> List[Criterion]:
 
 
 def shorten(text: str, max_len: int = 72) -> str:
-    t = re.sub(r"\s+", " ", text.strip())
+    t = " ".join(text.split())
     return t if len(t) <= max_len else t[: max_len - 1] + "…"
 
 
@@ -214,28 +221,22 @@ def extract_criteria(jd_text: str, founder_text: Optional[str]) -> List[Criterio
     candidates: List[Tuple[str, str]] = []
     # Requirements
     for b in req_bullets:
-        tier = classify_tier(b)
-        # Default requirements to Must if no explicit tier words
-        if tier in ("Should", "Nice"):
-            tier = "Must"
+        # Requirements are Must whatever tier words they carry, so only the
+        # soft-skill demotion applies.
+        # Both patterns are re.I, so the bullet is searched as-is without lowering.
+        tier = "Must"
         # demote soft-skill lines to Should unless they include must/degree/years
-        if SOFT_SKILL_HINTS.search(b) and not re.search(r"\b(degree|\d+\+?\s*(years|yrs)|must|required)\b", b, re.I):
+        if SOFT_SKILL_HINTS.search(b) and not _HARD_REQ_RE.search(b):
             tier = "Should"
         candidates.append((b, tier))
-    # Responsibilities are often capability/skill → Should by default
+    # Responsibilities are often capability/skill → always Should
     for b in resp_bullets:
-        tier = classify_tier(b)
-        if not SOFT_SKILL_HINTS.search(b):
-            tier = "Should"
-        else:
-            tier = "Should"
-        candidates.append((b, tier))
+        candidates.append((b, "Should"))
 
     # Founder notes can promote or demote certain criteria via hints
     if founder_text:
-        lines_ = lines(founder_text)
-        for l in lines_:
-            m = re.match(r"^(must|should|nice)\s*:\s*(.+)$", l.strip(), re.I)
+        for l in lines(founder_text):
+            m = _FOUNDER_TIER_RE.match(l.strip())
             if m:
                 tier = m.group(1).capitalize()
                 text = m.group(2).strip()
@@ -248,19 +249,19 @@ def extract_deal_breakers(jd_text: str, founder_text: Optional[str]) -> List[str
     items: List[str] = []
     for l in lines(jd_text):
         low = l.lower()
-        if any(re.search(p, low) for p in MUST_PATTERNS + DEAL_BREAKER_HINTS):
+        if any(k in low for k in _DEAL_LITERALS) and _DEAL_RE.search(low):
             if is_bullet(l) or any(k in low for k in ["must", "required", "authorization", "clearance", "on-site", "in-office"]):
-                items.append(re.sub(r"^[-*•] ", "", l).strip())
+                items.append(_BULLET_RE.sub("", l).strip())
     if founder_text:
         for l in lines(founder_text):
             low = l.lower()
             if low.startswith("deal:") or low.startswith("dealbreaker:") or "deal breaker" in low:
-                items.append(re.sub(r"^(deal:|dealbreaker:)\s*", "", l, flags=re.I).strip())
+                items.append(_DEAL_PREFIX_RE.sub("", l).strip())
     # Deduplicate while preserving order
     seen = set()
     out: List[str] = []
     for it in items:
-        key = re.sub(r"\s+", " ", it.lower()).strip()
+        key = " ".join(it.lower().split())
         if key in seen:
             continue
         seen.add(key)
@@ -310,7 +311,7 @@ def write_outputs(out_json: Path, rubric: Rubric, deal_breakers: List[str], dry_
 
     rubric_json = {
         "job_id": rubric.job_id,
-        "criteria": [asdict(c) for c in rubric.criteria],
+        "criteria": [c.to_dict() for c in rubric.criteria],
         "bands": rubric.bands,
     }
     rubric_md = render_rubric_md(rubric)
@@ -322,9 +323,12 @@ def write_outputs(out_json: Path, rubric: Rubric, deal_breakers: List[str], dry_
         return md_path, deals_path
 
     out_dir.mkdir(parents=True, exist_ok=True)
-    out_json.write_text(json.dumps(rubric_json, indent=2), encoding="utf-8")
+    # json.dump streams into the file rather than building the whole document first
+    with out_json.open("w", encoding="utf-8") as f:
+        json.dump(rubric_json, f, indent=2)
     md_path.write_text(rubric_md, encoding="utf-8")
-    deals_path.write_text(json.dumps(deal_breakers, indent=2), encoding="utf-8")
+    with deals_path.open("w", encoding="utf-8") as f:
+        json.dump(deal_breakers, f, indent=2)
     logger.info("Wrote rubric.json → %s", out_json)
     logger.info("Wrote rubric.md → %s", md_path)
     logger.info("Wrote deal_breakers.json → %s", deals_path)
@@ -1,4 +1,3 @@
-from llm_generator import generate_rubric_llm
 #!/usr/bin/env python3
 """
 Rubric Generator v2
@@ -14,6 +13,8 @@ Usage:
     [--role-type management-consultant|software-engineer|product-manager] \\
     [--dry-run]
 
+  python workers/rubric/main_v2.py --batch-dir jobs [--role-type ...] [--dry-run]
+
 Design:
 - Load role template (default criteria)
 - LLM analyzes JD → customizes template
@@ -25,19 +26,52 @@ Quality:
 - Logging, --dry-run, error handling, verification
 """
 import argparse
+import functools
+import hashlib
 import json
 import logging
 import os
-from dataclasses import dataclass, asdict
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict, fields, is_dataclass
 from pathlib import Path
 from typing import List, Dict, Optional, Literal
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
+CACHE_PATH = Path(__file__).resolve().parents[2] / "jobs" / ".rubric_cache.json"
+
+# Role keywords (case-insensitive substring match on the JD), highest precedence first
+_ROLE_KEYWORDS = {
+    "management-consultant": ("consultant", "consulting", "strategy", "advisory", "client"),
+    "software-engineer": ("engineer", "software", "developer", "programming", "coding"),
+    "product-manager": ("product manager", "product lead", "pm", "product strategy"),
+}
+_ROLE_NAMES = tuple(_ROLE_KEYWORDS)
+# Group r<i> is role i. Zero-width lookahead visits every offset, so a keyword is only
+# hidden when a higher-precedence one matches at the same spot, which wins anyway.
+_ROLE_RE = re.compile("(?=(?:" + "|".join(
+    f"(?P<r{i}>{'|'.join(map(re.escape, kws))})" for i, kws in enumerate(_ROLE_KEYWORDS.values())
+) + "))", re.I)
+
+# Hard-requirement phrasing scanned by the fallback generator, compiled once
+_DEAL_BREAKER_PATTERNS = tuple(re.compile(p, re.I | re.M) for p in (
+    r'must\s+(?:have|be)\s+(.+?)(?:\.|;|\n)',
+    r'required:\s+(.+?)(?:\.|;|\n)',
+    r'authorization\s+to\s+work',
+    r'\d+\+?\s*years?\s+(?:of\s+)?(?:experience|exp)',
+    r'(?:bachelor|master|phd|degree)\s+(?:required|in)',
+))
+
 # Structured output models
-@dataclass
+@dataclass(slots=True)
 class Criterion:
     id: str
     name: str
@@ -48,7 +82,7 @@ class Criterion:
     keywords: List[str]
     jd_evidence: Optional[str] = None  # Where in JD this came from
 
-@dataclass
+@dataclass(slots=True)
 class Rubric:
     job_id: str
     job_title: str
@@ -70,8 +104,58 @@ class Rubric:
         return True
 
 
+class RubricCache:
+    """Generated rubrics keyed by a SHA-256 of their inputs, persisted as one JSON file."""
+
+    def __init__(self, path: Path = CACHE_PATH):
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.dirty = False
+        if path.exists():
+            try:
+                self.entries = json.loads(path.read_text())
+            except Exception:
+                logger.warning(f"Rubric cache unreadable; starting empty: {path}")
+
+    @staticmethod
+    def key(jd_text: str, founder_notes: Optional[str], template: Dict) -> str:
+        payload = "\0".join([
+            jd_text,
+            founder_notes or "",
+            json.dumps(template, sort_keys=True),
+            template.get('role_type', ''),
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        return self.entries.get(key)
+
+    def put(self, key: str, rubric_dict: Dict):
+        self.entries[key] = rubric_dict
+        self.dirty = True
+
+    def invalidate(self):
+        self.entries.clear()
+        self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write beside the cache and swap it in, so an interrupted run never truncates it
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self.entries))
+        os.replace(tmp, self.path)
+        self.dirty = False
+
+
+def _rubric_from_dict(data: Dict) -> Rubric:
+    return Rubric(**{**data, 'criteria': [Criterion(**c) for c in data['criteria']]})
+
+
+@functools.lru_cache(maxsize=8)
 def load_role_template(role_type: str) -> Dict:
-    """Load default criteria for role type"""
+    """Load default criteria for role type (cached; callers must treat it as read-only)"""
     template_path = Path(__file__).parent.parent.parent / "data" / "role_templates" / f"{role_type}.json"
     if not template_path.exists():
         raise FileNotFoundError(f"Template not found: {template_path}")
@@ -81,22 +165,24 @@ def load_role_template(role_type: str) -> Dict:
 
 def detect_role_type(jd_text: str) -> str:
     """Heuristic role detection from JD"""
-    jd_lower = jd_text.lower()
-    
-    # Simple keyword matching (can be improved with LLM)
-    if any(kw in jd_lower for kw in ["consultant", "consulting", "strategy", "advisory", "client"]):
-        return "management-consultant"
-    elif any(kw in jd_lower for kw in ["engineer", "software", "developer", "programming", "coding"]):
-        return "software-engineer"
-    elif any(kw in jd_lower for kw in ["product manager", "product lead", "pm", "product strategy"]):
-        return "product-manager"
+    # Simple keyword matching (can be improved with LLM): one scan for all roles,
+    # earlier roles in _ROLE_KEYWORDS take precedence
+    best = None
+    for m in _ROLE_RE.finditer(jd_text):
+        idx = int(m.lastgroup[1:])
+        if best is None or idx < best:
+            best = idx
+            if best == 0:
+                break
+    if best is not None:
+        return _ROLE_NAMES[best]
     
     # Default fallback
     logger.warning("Could not detect role type, defaulting to management-consultant")
     return "management-consultant"
 
 
-def generate_rubric_llm(jd_text: str, template: Dict, founder_notes: Optional[str] = None, jd_path: Optional[Path] = None) -> Rubric:
+def build_rubric(jd_text: str, template: Dict, founder_notes: Optional[str] = None, jd_path: Optional[Path] = None, cache: Optional[RubricCache] = None) -> Rubric:
     """
     Use LLM to generate rubric from template + JD.
     
@@ -118,7 +204,18 @@ def generate_rubric_llm(jd_text: str, template: Dict, founder_notes: Optional[st
     # Derive job_id from path
     job_id = jd_path.parent.name if jd_path else "unknown"
     
+    # Unchanged inputs → reuse the stored rubric and skip generation entirely
+    cache_key = RubricCache.key(jd_text, founder_notes, template) if cache is not None else None
+    if cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.info(f"Rubric cache hit ({cache_key[:12]})")
+            rubric = _rubric_from_dict(cached)
+            rubric.job_id = job_id
+            return rubric
+    
     # Build prompt
+    founder_section = f"# Founder Notes\n{founder_notes}" if founder_notes else ""
     prompt = f"""You are an expert recruiter analyzing a job description to create a comprehensive scoring rubric.
 
 # Role Template (Starting Point)
@@ -127,7 +224,7 @@ def generate_rubric_llm(jd_text: str, template: Dict, founder_notes: Optional[st
 # Job Description
 {jd_text}
 
-{f"# Founder Notes\\n{founder_notes}" if founder_notes else ""}
+{founder_section}
 
 # Task
 Generate a comprehensive rubric with 15-25 criteria that captures:
@@ -189,7 +286,7 @@ Be specific in evaluation guidance. Make it actionable for scoring.
     
     # TODO: Replace with actual LLM call
     # For MVP, we'll use the template with JD-specific adjustments
-    rubric_data = generate_rubric_llm(jd_text, job_title)
+    rubric_data = _fallback_rubric_generation(jd_text, template, job_title)
     
     # Parse and validate
     criteria = [Criterion(**c) for c in rubric_data['criteria']]
@@ -207,30 +304,44 @@ Be specific in evaluation guidance. Make it actionable for scoring.
     if not rubric.validate():
         raise ValueError("Rubric validation failed")
     
+    if cache_key is not None:
+        cache.put(cache_key, asdict(rubric))
+    
     return rubric
 
 
+@functools.lru_cache(maxsize=128)
+def _keyword_patterns(keywords: tuple) -> tuple:
+    """(whole-word mention pattern, substring evidence pattern) for one criterion's keywords."""
+    alternation = '|'.join(re.escape(kw.lower()) for kw in keywords)
+    mention_re = re.compile(rf'\b(?:{alternation})\b', re.I)
+    evidence_re = re.compile(alternation)
+    return mention_re, evidence_re
+
+
 def _fallback_rubric_generation(jd_text: str, template: Dict, job_title: str) -> Dict:
     """
     Fallback rubric generation using heuristics.
     This is a placeholder until we integrate actual LLM calls.
     """
-    import re
+    # Lowercase and split the JD once; every criterion scans the same lines
+    jd_lines = jd_text.split('\n')
+    jd_lines_lower = jd_text.lower().split('\n')
     
     # Start with template criteria
     criteria = []
     for c in template['default_criteria']:
         # Check if JD mentions this criterion
         keywords = c.get('keywords', [])
-        mentions = sum(1 for kw in keywords if re.search(rf'\b{re.escape(kw)}\b', jd_text, re.I))
+        mention_re, evidence_re = _keyword_patterns(tuple(keywords)) if keywords else (None, None)
         
         # Adjust weight based on JD emphasis
         base_weight = c['weight']
-        if mentions > 0:
+        if mention_re is not None and mention_re.search(jd_text):
             # Find evidence in JD
             evidence_lines = []
-            for line in jd_text.split('\n'):
-                if any(kw.lower() in line.lower() for kw in keywords):
+            for line, line_lower in zip(jd_lines, jd_lines_lower):
+                if evidence_re.search(line_lower):
                     evidence_lines.append(line.strip())
                     if len(evidence_lines) >= 2:
                         break
@@ -255,17 +366,9 @@ def _fallback_rubric_generation(jd_text: str, template: Dict, job_title: str) ->
         c['weight'] = round((c['weight'] / total) * 100, 2)
     
     # Extract deal breakers
-    deal_breaker_patterns = [
-        r'must\s+(?:have|be)\s+(.+?)(?:\.|;|\n)',
-        r'required:\s+(.+?)(?:\.|;|\n)',
-        r'authorization\s+to\s+work',
-        r'\d+\+?\s*years?\s+(?:of\s+)?(?:experience|exp)',
-        r'(?:bachelor|master|phd|degree)\s+(?:required|in)',
-    ]
-    
     deal_breakers = []
-    for pattern in deal_breaker_patterns:
-        matches = re.findall(pattern, jd_text, re.I | re.M)
+    for pattern in _DEAL_BREAKER_PATTERNS:
+        matches = pattern.findall(jd_text)
         deal_breakers.extend(matches[:3])  # Limit to prevent noise
     
     return {
@@ -275,6 +378,39 @@ def _fallback_rubric_generation(jd_text: str, template: Dict, job_title: str) ->
     }
 
 
+def generate_rubrics_batch(jd_paths: List[Path], role_type: Optional[str] = None, cache: Optional[RubricCache] = None) -> Dict[Path, Rubric]:
+    """
+    Generate rubrics for several JDs in one process, keyed by JD path.
+    A JD that fails is logged and left out; the rest of the batch continues.
+    """
+    rubrics: Dict[Path, Rubric] = {}
+    for jd_path in jd_paths:
+        try:
+            jd_text = jd_path.read_text()
+            template = load_role_template(role_type or detect_role_type(jd_text))
+            rubrics[jd_path] = build_rubric(jd_text, template, jd_path=jd_path, cache=cache)
+        except Exception as e:
+            logger.error(f"Rubric generation failed for {jd_path}: {e}")
+    return rubrics
+
+
+def _json_default(o):
+    """json.dump hook: emit dataclasses field-by-field as the encoder reaches them."""
+    if is_dataclass(o):
+        return {f.name: getattr(o, f.name) for f in fields(o)}
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+def _write_json(path: Path, obj) -> None:
+    if orjson is not None:
+        # orjson encodes dataclasses natively, so no asdict() copy either way
+        path.write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+        return
+    with open(path, 'w') as f:
+        # No asdict(): it deep-copies every criterion before encoding starts
+        json.dump(obj, f, default=_json_default, indent=2)
+
+
 def write_outputs(rubric: Rubric, out_path: Path, dry_run: bool = False):
     """Write rubric.json, rubric.md, deal_breakers.json"""
     out_dir = out_path.parent
@@ -293,12 +429,20 @@ def write_outputs(rubric: Rubric, out_path: Path, dry_run: bool = False):
     
     # Write JSON
     out_dir.mkdir(parents=True, exist_ok=True)
-    with open(rubric_json_path, 'w') as f:
-        json.dump(asdict(rubric), f, indent=2)
+    _write_json(rubric_json_path, rubric)
     logger.info(f"Wrote rubric.json → {rubric_json_path}")
     
-    # Write Markdown
-    md_content = f"""# Rubric — {rubric.job_title}
+    # Write Markdown: collect pieces and join once rather than growing one string
+    # Partition criteria by tier and total the weights in one pass
+    by_tier: Dict[str, List[Criterion]] = {"must": [], "should": [], "nice": []}
+    total_weight = 0.0
+    for c in rubric.criteria:
+        by_tier.setdefault(c.tier, []).append(c)
+        total_weight += c.weight
+    
+    parts = []
+    append = parts.append
+    append(f"""# Rubric — {rubric.job_title}
 
 **Role Type:** {rubric.role_type}  
 **Created:** {rubric.created_at}  
@@ -306,28 +450,28 @@ def write_outputs(rubric: Rubric, out_path: Path, dry_run: bool = False):
 
 ---
 
-## Criteria (sum to {sum(c.weight for c in rubric.criteria):.1f})
+## Criteria (sum to {total_weight:.1f})
 
-"""
+""")
     
     for tier in ["must", "should", "nice"]:
-        tier_criteria = [c for c in rubric.criteria if c.tier == tier]
+        tier_criteria = by_tier[tier]
         if not tier_criteria:
             continue
         
-        md_content += f"\n### {tier.capitalize()} ({sum(c.weight for c in tier_criteria):.1f}%)\n\n"
+        append(f"\n### {tier.capitalize()} ({sum(c.weight for c in tier_criteria):.1f}%)\n\n")
         
         for c in tier_criteria:
-            md_content += f"**{c.name}** — {c.weight:.1f}%\n"
-            md_content += f"- {c.description}\n"
-            md_content += f"- Evidence: {c.jd_evidence}\n"
-            md_content += f"- Keywords: {', '.join(c.keywords)}\n"
-            md_content += f"- Evaluation:\n"
+            append(f"**{c.name}** — {c.weight:.1f}%\n")
+            append(f"- {c.description}\n")
+            append(f"- Evidence: {c.jd_evidence}\n")
+            append(f"- Keywords: {', '.join(c.keywords)}\n")
+            append("- Evaluation:\n")
             for band, guidance in c.evaluation_guidance.items():
-                md_content += f"  - {band}: {guidance}\n"
-            md_content += "\n"
+                append(f"  - {band}: {guidance}\n")
+            append("\n")
     
-    md_content += f"""---
+    append(f"""---
 
 ## Deal Breakers
 
@@ -338,57 +482,86 @@ def write_outputs(rubric: Rubric, out_path: Path, dry_run: bool = False):
 ## Meta Signals
 
 {chr(10).join(f"- **{k}**: {v}" for k, v in rubric.meta_signals.items())}
-"""
+""")
+    md_content = "".join(parts)
     
     with open(rubric_md_path, 'w') as f:
         f.write(md_content)
     logger.info(f"Wrote rubric.md → {rubric_md_path}")
     
     # Write deal breakers
-    with open(deal_breakers_path, 'w') as f:
-        json.dump(rubric.deal_breakers, f, indent=2)
+    _write_json(deal_breakers_path, rubric.deal_breakers)
     logger.info(f"Wrote deal_breakers.json → {deal_breakers_path}")
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Rubric Generator v2")
-    parser.add_argument("--jd", required=True, help="Path to job-description.md")
-    parser.add_argument("--out", required=True, help="Path to output rubric.json")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--jd", help="Path to job-description.md")
+    src.add_argument("--batch-dir", dest="batch_dir", help="Generate rubric.json for every <dir>/<job>/job-description.md")
+    parser.add_argument("--out", help="Path to output rubric.json (required with --jd)")
     parser.add_argument("--founder-notes", dest="founder_notes", help="Optional founder notes")
     parser.add_argument("--role-type", dest="role_type", 
                        choices=["management-consultant", "software-engineer", "product-manager"],
                        help="Role type (auto-detected if not specified)")
     parser.add_argument("--dry-run", action="store_true")
+    parser.add_argument("--no-cache", dest="no_cache", action="store_true", help="Always regenerate; don't read or write the rubric cache")
+    parser.add_argument("--invalidate", action="store_true", help="Clear the rubric cache before generating")
     args = parser.parse_args()
+    if args.jd and not args.out:
+        parser.error("--out is required with --jd")
+    
+    cache = None if args.no_cache else RubricCache()
+    if cache is not None and args.invalidate:
+        cache.invalidate()
+    
+    if args.batch_dir:
+        # One process for the whole queue: each rubric lands beside its JD
+        jd_paths = sorted(Path(args.batch_dir).resolve().glob("*/job-description.md"))
+        rubrics = generate_rubrics_batch(jd_paths, role_type=args.role_type, cache=cache)
+        written = 0
+        for jd_path, rubric in rubrics.items():
+            try:
+                write_outputs(rubric, jd_path.parent / "rubric.json", dry_run=args.dry_run)
+                written += 1
+            except Exception as e:
+                logger.error(f"Writing rubric failed for {jd_path}: {e}")
+        if cache is not None and not args.dry_run:
+            cache.save()
+        logger.info(f"Generated {written}/{len(jd_paths)} rubrics")
+        return 0 if written == len(jd_paths) else 1
     
     try:
-        # Load JD
         jd_path = Path(args.jd).resolve()
         if not jd_path.exists():
             raise FileNotFoundError(f"JD not found: {jd_path}")
-        jd_text = jd_path.read_text()
-        
-        # Load founder notes
-        founder_text = None
-        if args.founder_notes:
-            founder_path = Path(args.founder_notes).resolve()
-            if founder_path.exists():
-                founder_text = founder_path.read_text()
-        
-        # Detect or use specified role type
-        role_type = args.role_type or detect_role_type(jd_text)
-        logger.info(f"Role type: {role_type}")
+        founder_path = Path(args.founder_notes).resolve() if args.founder_notes else None
         
-        # Load template
-        template = load_role_template(role_type)
+        # Issue the independent reads together: JD, founder notes, and the template
+        # when --role-type names it (otherwise it depends on the JD's detected role)
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            jd_future = pool.submit(jd_path.read_text)
+            founder_future = pool.submit(founder_path.read_text) if founder_path and founder_path.exists() else None
+            template_future = pool.submit(load_role_template, args.role_type) if args.role_type else None
+            
+            jd_text = jd_future.result()
+            founder_text = founder_future.result() if founder_future else None
+            
+            # Detect or use specified role type
+            role_type = args.role_type or detect_role_type(jd_text)
+            logger.info(f"Role type: {role_type}")
+            
+            template = template_future.result() if template_future else load_role_template(role_type)
         logger.info(f"Loaded template with {len(template['default_criteria'])} default criteria")
         
         # Generate rubric
-        rubric = generate_rubric_llm(jd_text, template, founder_text, jd_path=jd_path)
+        rubric = build_rubric(jd_text, template, founder_text, jd_path=jd_path, cache=cache)
         logger.info(f"Generated rubric with {len(rubric.criteria)} criteria")
         
         # Write outputs
         write_outputs(rubric, Path(args.out).resolve(), dry_run=args.dry_run)
+        if cache is not None and not args.dry_run:
+            cache.save()
         
         return 0
         
@@ -13,9 +13,12 @@ Provides criterion-by-criterion evaluation with:
 Never fails hard - always produces scores, logs degradation.
 """
 import argparse
+import functools
 import json
 import logging
+import re
 import sys
+from collections import Counter
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
@@ -31,6 +34,21 @@ from detector import detect_ai_resume
 logging.basicConfig(level=logging.INFO, format="%(asctime)sZ %(levelname)s %(message)s")
 logger = logging.getLogger(__name__)
 
+# Heuristic criterion buckets, matched against description + name; earlier buckets win
+_CRITERION_BUCKETS = (
+    ("education", ("education", "academic", "degree")),
+    ("analytical", ("analyt", "problem", "quantitative")),
+    ("client", ("client", "stakeholder")),
+    ("business", ("business", "functional", "operations", "strategy")),
+    ("leadership", ("leadership", "led team")),
+    ("communication", ("communication", "presentation")),
+    ("learning", ("learning", "adapt", "agil")),
+    ("industry", ("industry", "sector", "domain")),
+)
+_BUCKET_INDEX = {term: i for i, (_, terms) in enumerate(_CRITERION_BUCKETS) for term in terms}
+# Zero-width lookahead so every offset is tried; no bucket term is a prefix of another
+_BUCKET_RE = re.compile("(?=(" + "|".join(map(re.escape, _BUCKET_INDEX)) + "))")
+
 
 def load_json(path: Path) -> Optional[Dict]:
     """Load JSON file, return None if missing/invalid"""
@@ -96,25 +114,9 @@ def calculate_elite_boost(elite_signals: List) -> float:
     return min(max_boost, 1.5)
 
 
-def score_criterion_semantic_llm(
-    criterion: Dict,
-    resume_text: str,
-    job_id: str,
-    signals: Dict
-) -> Dict:
-    """
-    Score a single criterion using LLM semantic evaluation.
-    
-    Returns: {
-        score: 0-10,
-        evidence: str,
-        reasoning: str,
-        match_type: direct|transferable|potential|none,
-        transferable_note: str (optional)
-    }
-    """
-    # Build focused prompt for this criterion
-    prompt = f"""You are an expert recruiter evaluating a candidate against a specific hiring criterion.
+def build_criterion_prompt(criterion: Dict, resume_text: str) -> str:
+    """Focused scoring prompt for one criterion (pure; no API call)."""
+    return f"""You are an expert recruiter evaluating a candidate against a specific hiring criterion.
 
 **CRITERION:**
 Name: {criterion.get('name')}
@@ -166,6 +168,26 @@ Return ONLY valid JSON:
   "transferable_note": "<if applicable>"
 }}
 """
+
+
+def score_criterion_semantic_llm(
+    criterion: Dict,
+    resume_text: str,
+    job_id: str,
+    signals: Dict
+) -> Dict:
+    """
+    Score a single criterion using LLM semantic evaluation.
+    
+    Returns: {
+        score: 0-10,
+        evidence: str,
+        reasoning: str,
+        match_type: direct|transferable|potential|none,
+        transferable_note: str (optional)
+    }
+    """
+    prompt = build_criterion_prompt(criterion, resume_text)
     
     # TODO: Replace with actual LLM API call
     # For MVP: Use subprocess to call system Python with inline logic
@@ -186,12 +208,72 @@ Return ONLY valid JSON:
         return None  # Trigger fallback
 
 
+def criterion_bucket(crit_lower: str) -> Optional[str]:
+    """Name of the first bucket in _CRITERION_BUCKETS whose terms appear, in one scan."""
+    best = None
+    for m in _BUCKET_RE.finditer(crit_lower):
+        idx = _BUCKET_INDEX[m.group(1)]
+        if best is None or idx < best:
+            best = idx
+            if best == 0:
+                break
+    return _CRITERION_BUCKETS[best][0] if best is not None else None
+
+
+@functools.lru_cache(maxsize=256)
+def _keyword_re(keywords: Tuple[str, ...]) -> "re.Pattern":
+    # Longest first: each offset records the longest keyword found there, and every
+    # other keyword occurring at that offset is a prefix of it
+    alternation = "|".join(re.escape(kw) for kw in sorted(set(keywords), key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))")
+
+
+# Fixed resume terms read by the heuristic scorer, meta-signals and red flags
+_PROMOTION_KEYWORDS = ('promoted', 'advanced', 'led to', 'progression', 'senior', 'director', 'vp', 'chief')
+_DIVERSE_KEYWORDS = ('learned', 'acquired', 'developed', 'pivot', 'transition', 'new')
+_INDUSTRY_KEYWORDS = ('industry', 'sector', 'domain', 'vertical')
+_RESUME_TERMS = (
+    'mba', 'master', 'phd', 'coach', 'advisor', 'consultant', 'led team', 'led', 'managed',
+    'senior', 'director', 'vp', 'present', 'spoke', 'taught', 'pivot', 'months', 'mo ',
+) + _PROMOTION_KEYWORDS + _DIVERSE_KEYWORDS + _INDUSTRY_KEYWORDS
+
+
+class TermCounts:
+    """
+    Occurrence counts of a fixed set of terms in lowered resume text, from one scan.
+    
+    Only query terms that were passed in. Counts include overlapping occurrences,
+    which equals str.count for terms that cannot overlap themselves ('led', 'months').
+    """
+    
+    def __init__(self, resume_lower: str, terms: Tuple[str, ...]):
+        self._hits = Counter(_keyword_re(terms).findall(resume_lower)) if terms else Counter()
+        self._counts: Dict[str, int] = {}
+    
+    def count(self, term: str) -> int:
+        n = self._counts.get(term)
+        if n is None:
+            # every occurrence of term is recorded as a longest hit that starts with it
+            n = self._counts[term] = sum(c for h, c in self._hits.items() if h.startswith(term))
+        return n
+    
+    def __contains__(self, term: str) -> bool:
+        return self.count(term) > 0
+
+
+def resume_term_counts(resume_lower: str, criteria: List[Dict] = ()) -> TermCounts:
+    """One TermCounts per candidate over every criterion keyword plus the fixed resume terms."""
+    keywords = {kw.lower() for c in criteria for kw in c.get('keywords', [])}
+    return TermCounts(resume_lower, tuple(sorted(keywords.union(_RESUME_TERMS))))
+
+
 def score_criterion_heuristic(
     criterion: Dict,
     resume_text: str,
     resume_lower: str,
     job_id_lower: str,
-    signals: Dict
+    signals: Dict,
+    terms: Optional[TermCounts] = None
 ) -> Dict:
     """
     Fallback heuristic scoring when LLM unavailable.
@@ -201,6 +283,8 @@ def score_criterion_heuristic(
     - Business impact → evidence of outcomes
     - Capability proxies → domain expertise
     - Keyword matching → baseline relevance
+    
+    terms: counts from resume_term_counts() shared across criteria; built here if omitted.
     """
     crit_id = criterion.get('id', '')
     crit_name = criterion.get('name', '')
@@ -213,7 +297,9 @@ def score_criterion_heuristic(
     capabilities = signals['capabilities']
     
     # Base score from keyword matching
-    keyword_matches = sum(1 for kw in keywords if kw in resume_lower)
+    if terms is None:
+        terms = resume_term_counts(resume_lower, [criterion])
+    keyword_matches = sum(1 for kw in keywords if kw in terms)
     keyword_density = keyword_matches / max(len(keywords), 1)
     
     score = 0
@@ -223,9 +309,10 @@ def score_criterion_heuristic(
     transferable_note = ""
     
     # === CRITERION-SPECIFIC SCORING ===
+    bucket = criterion_bucket(crit_lower)
     
     # Education / Academic
-    if 'education' in crit_lower or 'academic' in crit_lower or 'degree' in crit_lower:
+    if bucket == "education":
         edu_signals = [s for s in elite if s.type == 'top_tier_institution']
         if edu_signals:
             top = max(edu_signals, key=lambda x: x.boost_factor)
@@ -233,7 +320,7 @@ def score_criterion_heuristic(
             evidence = top.detail
             reasoning = f"Strong academic pedigree: {top.detail}"
             match_type = "direct"
-        elif 'mba' in resume_lower or 'master' in resume_lower or 'phd' in resume_lower:
+        elif 'mba' in terms or 'master' in terms or 'phd' in terms:
             score = 6
             evidence = "Graduate degree"
             reasoning = "Graduate education present"
@@ -245,7 +332,7 @@ def score_criterion_heuristic(
             match_type = "direct"
     
     # Analytical / Problem-Solving / Quantitative
-    elif any(term in crit_lower for term in ['analyt', 'problem', 'quantitative']):
+    elif bucket == "analytical":
         analytical_depth = capabilities.get('analytical_depth', 0)
         
         # Check for consulting (strong analytical proxy)
@@ -274,7 +361,7 @@ def score_criterion_heuristic(
             match_type = "potential" if keyword_density > 0.2 else "none"
     
     # Client / Stakeholder Engagement
-    elif any(term in crit_lower for term in ['client', 'stakeholder']):
+    elif bucket == "client":
         consulting_score = capabilities.get('consulting_skills', 0)
         
         if consulting_score >= 0.7:
@@ -282,7 +369,7 @@ def score_criterion_heuristic(
             evidence = "Direct consulting/client-facing experience"
             reasoning = "Proven client engagement capability"
             match_type = "direct"
-        elif 'coach' in resume_lower or 'advisor' in resume_lower or 'consultant' in resume_lower:
+        elif 'coach' in terms or 'advisor' in terms or 'consultant' in terms:
             score = 6
             evidence = "Coaching/advisory work"
             reasoning = "Transferable client-facing skills from coaching/advisory"
@@ -295,7 +382,7 @@ def score_criterion_heuristic(
             match_type = "potential" if keyword_density > 0.2 else "none"
     
     # Business Knowledge / Functional Expertise
-    elif any(term in crit_lower for term in ['business', 'functional', 'operations', 'strategy']):
+    elif bucket == "business":
         # Check for elite company experience
         elite_companies = [s for s in elite if s.type == 'elite_company']
         
@@ -317,14 +404,14 @@ def score_criterion_heuristic(
             match_type = "potential"
     
     # Leadership
-    elif 'leadership' in crit_lower or 'led team' in crit_lower:
-        if 'led team' in resume_lower or 'managed' in resume_lower:
-            count = resume_lower.count('led') + resume_lower.count('managed')
+    elif bucket == "leadership":
+        if 'led team' in terms or 'managed' in terms:
+            count = terms.count('led') + terms.count('managed')
             score = min(8, 5 + count)
             evidence = f"{count} leadership mentions"
             reasoning = "Evidence of team leadership"
             match_type = "direct"
-        elif 'senior' in resume_lower or 'director' in resume_lower or 'vp' in resume_lower:
+        elif 'senior' in terms or 'director' in terms or 'vp' in terms:
             score = 6
             evidence = "Senior title(s)"
             reasoning = "Leadership implied by seniority"
@@ -336,8 +423,8 @@ def score_criterion_heuristic(
             match_type = "none"
     
     # Communication
-    elif 'communication' in crit_lower or 'presentation' in crit_lower:
-        if 'present' in resume_lower or 'spoke' in resume_lower or 'taught' in resume_lower:
+    elif bucket == "communication":
+        if 'present' in terms or 'spoke' in terms or 'taught' in terms:
             score = 7
             evidence = "Presentation/speaking experience"
             reasoning = "Evidence of communication capability"
@@ -349,9 +436,9 @@ def score_criterion_heuristic(
             match_type = "potential"
     
     # Learning Agility / Adaptability
-    elif 'learning' in crit_lower or 'adapt' in crit_lower or 'agil' in crit_lower:
+    elif bucket == "learning":
         # Check for career pivots, diverse roles
-        if 'pivot' in resume_lower or len(elite) >= 2:
+        if 'pivot' in terms or len(elite) >= 2:
             score = 7
             evidence = "Career transitions/diverse experience"
             reasoning = "Demonstrated learning agility through career moves"
@@ -363,10 +450,9 @@ def score_criterion_heuristic(
             match_type = "potential"
     
     # Industry Expertise
-    elif 'industry' in crit_lower or 'sector' in crit_lower or 'domain' in crit_lower:
+    elif bucket == "industry":
         # Count years in similar industry (hard to extract - use proxy)
-        industry_keywords = ['industry', 'sector', 'domain', 'vertical']
-        if sum(1 for kw in industry_keywords if kw in resume_lower) >= 2:
+        if sum(1 for kw in _INDUSTRY_KEYWORDS if kw in terms) >= 2:
             score = 6
             evidence = "Industry experience evident"
             reasoning = "Domain knowledge present"
@@ -411,15 +497,15 @@ def score_criterion_heuristic(
     }
 
 
-def synthesize_meta_signals(resume_text: str, signals: Dict) -> Dict:
+def synthesize_meta_signals(resume_text: str, signals: Dict, terms: Optional[TermCounts] = None) -> Dict:
     """Generate meta-signals from holistic resume analysis"""
-    resume_lower = resume_text.lower()
+    if terms is None:
+        terms = resume_term_counts(resume_text.lower())
     impacts = signals['business_impact']
     elite = signals['elite_signals']
     
     # Trajectory: Look for promotion indicators
-    promotion_keywords = ['promoted', 'advanced', 'led to', 'progression', 'senior', 'director', 'vp', 'chief']
-    promotion_count = sum(1 for kw in promotion_keywords if kw in resume_lower)
+    promotion_count = sum(1 for kw in _PROMOTION_KEYWORDS if kw in terms)
     
     if promotion_count >= 3 or len(elite) >= 2:
         trajectory = "ascending"
@@ -452,8 +538,7 @@ def synthesize_meta_signals(resume_text: str, signals: Dict) -> Dict:
         narrative_note = "Career story present but could be clearer"
     
     # Learning Velocity: Career pivots, skill acquisition
-    diverse_keywords = ['learned', 'acquired', 'developed', 'pivot', 'transition', 'new']
-    learning_indicators = sum(1 for kw in diverse_keywords if kw in resume_lower)
+    learning_indicators = sum(1 for kw in _DIVERSE_KEYWORDS if kw in terms)
     
     if learning_indicators >= 3 or len(elite) >= 2:
         learning_velocity = "fast"
@@ -477,10 +562,11 @@ def synthesize_meta_signals(resume_text: str, signals: Dict) -> Dict:
     }
 
 
-def identify_red_flags(resume_text: str, fields: Dict, signals: Dict) -> List[Dict]:
+def identify_red_flags(resume_text: str, fields: Dict, signals: Dict, terms: Optional[TermCounts] = None) -> List[Dict]:
     """Identify potential concerns"""
     flags = []
-    resume_lower = resume_text.lower()
+    if terms is None:
+        terms = resume_term_counts(resume_text.lower())
     ai_detection = signals['ai_detection']
     
     # AI-generated content
@@ -509,7 +595,7 @@ def identify_red_flags(resume_text: str, fields: Dict, signals: Dict) -> List[Di
     
     # Job hopping pattern (many short stints)
     # Proxy: Count short time mentions
-    short_stints = resume_lower.count('months') + resume_lower.count('mo ')
+    short_stints = terms.count('months') + terms.count('mo ')
     if short_stints >= 3:
         flags.append({
             "flag": "Potential job hopping",
@@ -544,6 +630,8 @@ def score_all_criteria(
     criteria = rubric.get('criteria', [])
     resume_lower = resume_text.lower()
     job_id_lower = job_id.lower()
+    # One scan of the resume for every keyword and fixed term, shared by all scorers below
+    terms = resume_term_counts(resume_lower, criteria)
     
     scored_criteria = []
     total_weighted_score = 0.0
@@ -564,7 +652,7 @@ def score_all_criteria(
         # Fallback to heuristic
         if result is None:
             logger.info(f"  Using heuristic fallback for {crit_name}")
-            result = score_criterion_heuristic(criterion, resume_text, resume_lower, job_id_lower, signals)
+            result = score_criterion_heuristic(criterion, resume_text, resume_lower, job_id_lower, signals, terms)
         
         score = result['score']
         weighted_score = (score / 10.0) * weight
@@ -588,10 +676,10 @@ def score_all_criteria(
     total_percentage = (total_weighted_score / total_max_weighted * 100) if total_max_weighted > 0 else 0
     
     # Generate meta-signals
-    meta_signals = synthesize_meta_signals(resume_text, signals)
+    meta_signals = synthesize_meta_signals(resume_text, signals, terms)
     
     # Identify red flags
-    red_flags = identify_red_flags(resume_text, fields, signals)
+    red_flags = identify_red_flags(resume_text, fields, signals, terms)
     
     # Overall assessment
     if total_percentage >= 80:
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Fast decision lookup for gestalt_evaluation.json, shared by the email batch runners.
+
+gestalt_evaluation.json has a single top-level "decision" string field, so it is
+pulled from the raw bytes without decoding the whole evaluation.
+"""
+import json
+import re
+from pathlib import Path
+from typing import Optional
+
+DECISION_RE = re.compile(rb'"decision"\s*:\s*"([^"]+)"')
+
+
+def read_decision(path: Path) -> Optional[str]:
+    """Decision from a gestalt file; full JSON parse only if the pattern misses. None if unreadable."""
+    try:
+        raw = path.read_bytes()
+    except OSError:
+        return None
+    m = DECISION_RE.search(raw)
+    if m:
+        return m.group(1).decode("utf-8", "replace")
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return None
+    return data.get("decision") if isinstance(data, dict) else None